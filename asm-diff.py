@@ -0,0 +1,307 @@
+import argparse
+import gzip
+import hashlib
+import os
+import pickle
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import Pool, TimeoutError
+
+from elfutils import content_key, read_manifest, scan_elf_files
+
+OBJDUMP_CMD = ["objdump", "-d", "-Mintel", "--no-addresses", "--no-show-raw-insn"]
+FUNCTION_HEADER = re.compile(r"^<(.*)>:$")
+
+# Bump when the disassembly command or the normalization changes
+CACHE_VERSION = "v2"
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "phoronix-benchmark-infra",
+    "asm-diff",
+)
+
+
+def disassemble(binary_file):
+    # Generate assembly dump with Intel syntax and no addresses
+    result = subprocess.run(
+        OBJDUMP_CMD + [binary_file],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+    )
+    return result.stdout
+
+
+def parse_functions(dump):
+    # Map each function to the lines of its body, in a single pass over the dump.
+    # Functions with the same name (e.g. static functions from different
+    # translation units) are concatenated, as the sed range extraction did.
+    functions = {}
+    body = None
+    for line in dump.splitlines():
+        match = FUNCTION_HEADER.match(line)
+        if match:
+            body = functions.setdefault(match.group(1), [])
+        elif line.startswith("Disassembly of section"):
+            body = None
+        elif body is not None:
+            body.append(line)
+
+    for lines in functions.values():
+        while lines and not lines[-1]:
+            lines.pop()
+
+    return functions
+
+
+def instruction_count(lines):
+    return sum(1 for line in lines if line.strip())
+
+
+def summarize_functions(functions):
+    # Hash and instruction count of every function, which is all comparing two
+    # functions needs (strict and loose)
+    summary = {}
+    for func, lines in functions.items():
+        body = "\n".join(lines)
+        digest = hashlib.blake2b(body.encode(), digest_size=16).digest()
+        summary[func] = (digest, instruction_count(lines))
+    return summary
+
+
+class DisassemblyCache:
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = os.path.join(cache_dir, CACHE_VERSION)
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pickle.gz")
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                summary = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        return summary
+
+    def store(self, key, summary):
+        # Write atomically, as several workers may store the same binary
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            pickle.dump(summary, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(key))
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits its size cap
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pickle.gz"):
+                # Concurrent asm-diffs may evict the same entries
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def function_summary(binary_file, build=None, cache=None):
+    if cache is None:
+        return summarize_functions(parse_functions(disassemble(binary_file)))
+
+    # Only disassemble binaries that were never seen before
+    key = content_key(binary_file, build)
+    summary = cache.load(key)
+    if summary is None:
+        summary = summarize_functions(parse_functions(disassemble(binary_file)))
+        cache.store(key, summary)
+    return summary
+
+
+def compare_functions(base_functions, other_functions):
+    all_funcs = set()
+    diff_funcs = set()
+    diff_loose_funcs = set()
+
+    for func, (base_digest, base_count) in base_functions.items():
+        # Skip empty names and special characters
+        if not func or "<" in func or ">" in func:
+            continue
+
+        all_funcs.add(func)
+
+        # Skip if function doesn't exist in both binaries, or is empty in either
+        if func not in other_functions:
+            continue
+        other_digest, other_count = other_functions[func]
+        if base_count == 0 or other_count == 0:
+            continue
+
+        # === STRICT COMPARISON ===
+        if base_digest == other_digest:
+            continue
+        diff_funcs.add(func)
+
+        # === LOOSE COMPARISON ===
+        # Only report functions with added or removed instructions, ignoring
+        # changes that merely replace instructions in place
+        if base_count != other_count:
+            diff_loose_funcs.add(func)
+
+    return all_funcs, diff_funcs, diff_loose_funcs
+
+
+def diff_binary(base_file, other_file, base_build=None, other_build=None, cache=None):
+    base_functions = function_summary(base_file, base_build, cache)
+    other_functions = function_summary(other_file, other_build, cache)
+    return compare_functions(base_functions, other_functions)
+
+
+# Disassembly cache of the pool workers, set by init_worker
+CACHE = None
+
+
+def init_worker(cache):
+    global CACHE
+    CACHE = cache
+
+
+def diff_binary_pair(pair):
+    return diff_binary(*pair, cache=CACHE)
+
+
+def write_functions(path, functions):
+    with open(path, "w") as f:
+        for func in sorted(functions):
+            f.write(f"{func}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the assembly of the ELF files of two installs"
+    )
+    parser.add_argument("base_dir", type=str, help="Baseline install directory")
+    parser.add_argument("other_dir", type=str, help="Prototype install directory")
+    parser.add_argument("output_dir", type=str, help="ASM diff output directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=len(os.sched_getaffinity(0)),
+        help="Number of workers (defaults to the number of usable CPUs)",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=int, default=600, help="Timeout in seconds"
+    )
+    parser.add_argument(
+        "--base-manifest", type=str, help="ELF manifest of the baseline install"
+    )
+    parser.add_argument(
+        "--other-manifest", type=str, help="ELF manifest of the prototype install"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="Disassembly cache directory",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=10240,
+        help="Maximum disassembly cache size in MB",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not use the disassembly cache"
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.base_dir):
+        print(f"Base install directory {args.base_dir} does not exist!")
+        exit(1)
+    if not os.path.isdir(args.other_dir):
+        print(f"Other install directory {args.other_dir} does not exist!")
+        exit(1)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    cache = None
+    if not args.no_cache:
+        cache = DisassemblyCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    # Reuse the ELF manifests of the installs instead of rescanning them
+    if args.base_manifest:
+        base_elf_files = read_manifest(args.base_manifest)
+    else:
+        base_elf_files = scan_elf_files(args.base_dir)
+    if args.other_manifest:
+        other_builds = {
+            os.path.normpath(path): build
+            for path, _, _, build in read_manifest(args.other_manifest)
+        }
+    else:
+        other_builds = None
+
+    # Pair ELF files of the base install with the ones in the other install
+    pairs = []
+    for base_file, _, _, base_build in base_elf_files:
+        rel_path = os.path.relpath(base_file, args.base_dir)
+        other_file = os.path.normpath(os.path.join(args.other_dir, rel_path))
+        if other_builds is not None:
+            if other_file in other_builds:
+                other_build = other_builds[other_file]
+                pairs.append((base_file, other_file, base_build, other_build))
+        elif os.path.isfile(other_file):
+            pairs.append((base_file, other_file, base_build, None))
+
+    all_funcs = set()
+    diff_funcs = set()
+    diff_loose_funcs = set()
+    timed_out = False
+
+    deadline = time.monotonic() + args.timeout
+    # Hand the cache to the workers explicitly, whatever the start method
+    with Pool(processes=args.jobs, initializer=init_worker, initargs=(cache,)) as pool:
+        compared = pool.imap_unordered(diff_binary_pair, pairs)
+        for i in range(len(pairs)):
+            try:
+                binary_all, binary_diff, binary_loose = compared.next(
+                    timeout=max(0, deadline - time.monotonic())
+                )
+            except TimeoutError:
+                print(
+                    f"Timeout after {args.timeout}s, {len(pairs) - i} of {len(pairs)} binaries not compared",
+                    file=sys.stderr,
+                )
+                timed_out = True
+                break
+            all_funcs |= binary_all
+            diff_funcs |= binary_diff
+            diff_loose_funcs |= binary_loose
+
+    write_functions(os.path.join(args.output_dir, "all.txt"), all_funcs)
+    write_functions(os.path.join(args.output_dir, "diff.txt"), diff_funcs)
+    write_functions(os.path.join(args.output_dir, "diff_loose.txt"), diff_loose_funcs)
+    with open(os.path.join(args.output_dir, "timeout.txt"), "w") as f:
+        f.write("y\n" if timed_out else "n\n")
+
+    # Evict only once the outputs are written
+    if cache is not None:
+        cache.evict()
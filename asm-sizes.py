@@ -0,0 +1,48 @@
+import argparse
+import os
+
+from elfutils import ELFError, ELFFile, read_manifest
+
+
+class DeduplicatedWriter:
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.seen = set()
+
+    def write(self, size, func):
+        line = f"{size} {func}\n"
+        if line not in self.seen:
+            self.seen.add(line)
+            self.file.write(line)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the size of the functions of the ELF files in a manifest"
+    )
+    parser.add_argument("manifest_file", type=str, help="ELF manifest file")
+    parser.add_argument("sizes_file", type=str, help="Output function sizes file")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.manifest_file):
+        print(f"Manifest file {args.manifest_file} does not exist!")
+        exit(1)
+
+    print(f"Writing ASM function sizes to {args.sizes_file}")
+    with DeduplicatedWriter(args.sizes_file) as writer:
+        for path, _, _, _ in read_manifest(args.manifest_file):
+            try:
+                with ELFFile(path) as elf:
+                    for func, size in elf.function_symbols():
+                        writer.write(size, func)
+            except (OSError, ELFError) as e:
+                print(f"Skipping {path}: {e}")
@@ -0,0 +1,91 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results-to-csv.py")
+
+
+def measure(argv, runs):
+    times = []
+    for _ in range(runs):
+        start = time.monotonic()
+        subprocess.run(
+            argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+        times.append(time.monotonic() - start)
+    return times
+
+
+def report(name, times, budget):
+    median = statistics.median(times)
+    status = "ok" if median <= budget else "over budget"
+    print(
+        f"{name}: median {median:.3f}s, min {min(times):.3f}s, budget {budget:.3f}s ({status})"
+    )
+    return median <= budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of results-to-csv.py against a budget"
+    )
+    parser.add_argument(
+        "results_dir",
+        type=str,
+        nargs="?",
+        help="Results directory to also time a CSV-only run on",
+    )
+    parser.add_argument(
+        "test_profiles_dir", type=str, nargs="?", help="Test profiles directory"
+    )
+    parser.add_argument(
+        "optimization_flag", type=str, nargs="?", default="O3", help="Optimization flag"
+    )
+    parser.add_argument(
+        "-r", "--runs", type=int, default=10, help="Number of runs of each command"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.5,
+        help="Startup budget, until the arguments are parsed (in seconds)",
+    )
+    parser.add_argument(
+        "--csv-budget",
+        type=float,
+        default=1.0,
+        help="Budget of the CSV-only run, with a warm cache (in seconds)",
+    )
+    args = parser.parse_args()
+
+    if args.results_dir and not os.path.isdir(args.results_dir):
+        print(f"Results directory {args.results_dir} does not exist!")
+        exit(1)
+
+    if args.results_dir and not args.test_profiles_dir:
+        print("Test profiles directory is required to time a CSV-only run!")
+        exit(1)
+
+    # Startup: interpreter, module imports and argument parsing
+    ok = report(
+        "startup", measure([sys.executable, SCRIPT, "--help"], args.runs), args.budget
+    )
+
+    # CSV-only run (no plots nor merges), with a warm extraction cache
+    if args.results_dir:
+        argv = [
+            sys.executable,
+            SCRIPT,
+            args.results_dir,
+            args.test_profiles_dir,
+            args.optimization_flag,
+        ]
+        times = measure(argv, args.runs + 1)[1:]
+        ok = report("csv-only", times, args.csv_budget) and ok
+    else:
+        print("csv-only: not measured (no results directory given)")
+
+    exit(0 if ok else 1)
@@ -0,0 +1,288 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Bump when the layout of the entries or the measured artefacts change
+CACHE_VERSION = "v2"
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "phoronix-benchmark-infra",
+    "build",
+)
+
+# Compile time, memory usage and size artefacts of an install, relative to the
+# results directory
+ARTEFACTS = [
+    "compile-records/{test}/{config}/{flag}.jsonl",
+    "compiler-logs/{test}/{config}/{flag}.txt",
+    "rounds/{test}/{config}/{flag}.json",
+    "inline-remarks/{test}/{config}/{flag}.txt",
+    "time-trace/{test}/{config}/{flag}.txt",
+    "object-size/{test}/{config}/{flag}.txt",
+    "section-size/{test}/{config}/{flag}.txt",
+    "asm-diff/{test}/{config}/{flag}/sizes.txt",
+]
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_digest(path):
+    # Digest of the names and contents of the files of a directory
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = sorted(name for name in dirnames if name != "__pycache__")
+        for filename in sorted(filenames):
+            file = os.path.join(dirpath, filename)
+            digest.update(os.path.relpath(file, path).encode())
+            digest.update(file_digest(file).encode())
+    return digest.hexdigest()
+
+
+def profile_version(test_profile_dir):
+    # Version of the test profile, and the digest of its files, so that
+    # profiles edited without a version bump are rebuilt too
+    root = ET.parse(os.path.join(test_profile_dir, "test-definition.xml")).getroot()
+    version = root.find(".//TestProfile/Version")
+    return (version.text if version is not None else ""), tree_digest(test_profile_dir)
+
+
+def build_key(
+    llvm_path, toolchain_path, flags, opt_flag, test_profile_dir, install_dir, extra
+):
+    # The installed tree may embed its install directory (e.g. in rpaths and
+    # manifests), so it is part of the key, and the toolchain wrappers decide
+    # how the compiles are measured
+    version, profile_digest = profile_version(test_profile_dir)
+    inputs = {
+        "clang": file_digest(os.path.realpath(os.path.join(llvm_path, "clang"))),
+        "toolchain": tree_digest(toolchain_path),
+        "flags": flags,
+        "opt_flag": opt_flag,
+        "version": version,
+        "profile": profile_digest,
+        "install_dir": os.path.abspath(install_dir),
+        "extra": extra,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def tree_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file = os.path.join(dirpath, filename)
+            if not os.path.islink(file):
+                size += os.path.getsize(file)
+    return size
+
+
+def copy(source, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.isdir(source):
+        shutil.copytree(source, target, symlinks=True)
+    else:
+        shutil.copy2(source, target)
+
+
+class BuildCache:
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = os.path.join(cache_dir, CACHE_VERSION)
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, install_dir, results_dir, artefacts):
+        entry_dir = self.path(key)
+        try:
+            with open(os.path.join(entry_dir, "entry.json"), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        shutil.rmtree(install_dir, ignore_errors=True)
+        copy(os.path.join(entry_dir, "install"), install_dir)
+        if os.path.exists(os.path.join(entry_dir, "install.elf-manifest")):
+            copy(
+                os.path.join(entry_dir, "install.elf-manifest"),
+                install_dir + ".elf-manifest",
+            )
+        for artefact in entry["artefacts"]:
+            target = os.path.join(results_dir, artefact)
+            if os.path.exists(target):
+                os.remove(target)
+            copy(os.path.join(entry_dir, "results", artefact), target)
+
+        # Mark the entry as recently used
+        os.utime(os.path.join(entry_dir, "entry.json"))
+        return True
+
+    def store(self, key, install_dir, results_dir, artefacts):
+        # Copy to a temporary entry first and rename it, as several jobs may
+        # store the same install
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+        copy(install_dir, os.path.join(tmp_dir, "install"))
+        if os.path.exists(install_dir + ".elf-manifest"):
+            copy(
+                install_dir + ".elf-manifest",
+                os.path.join(tmp_dir, "install.elf-manifest"),
+            )
+        stored = []
+        for artefact in artefacts:
+            source = os.path.join(results_dir, artefact)
+            if os.path.exists(source):
+                copy(source, os.path.join(tmp_dir, "results", artefact))
+                stored.append(artefact)
+
+        with open(os.path.join(tmp_dir, "entry.json"), "w") as f:
+            json.dump({"artefacts": stored, "size": tree_size(tmp_dir)}, f, indent=2)
+            f.write("\n")
+
+        shutil.rmtree(self.path(key), ignore_errors=True)
+        os.rename(tmp_dir, self.path(key))
+        return stored
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits its size cap
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tmp") or not entry.is_dir():
+                continue
+            entry_file = os.path.join(entry.path, "entry.json")
+            try:
+                with open(entry_file, "r") as f:
+                    size = json.load(f)["size"]
+                mtime = os.stat(entry_file).st_mtime
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append((mtime, size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cache installed tests with their compile time, memory usage and size artefacts"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="Build cache directory",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=51200,
+        help="Maximum build cache size in MB",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    key_parser = subparsers.add_parser("key", help="Print the key of an install")
+    # Flags are options, as they start with a dash (e.g. --flags=-march=native)
+    key_parser.add_argument(
+        "--llvm-path", type=str, required=True, help="Path to the LLVM bin directory"
+    )
+    key_parser.add_argument(
+        "--toolchain-path",
+        type=str,
+        required=True,
+        help="Path to the toolchain wrappers directory",
+    )
+    key_parser.add_argument("--flags", type=str, default="", help="Clang flags")
+    key_parser.add_argument(
+        "--opt-flag", type=str, required=True, help="Optimization flag"
+    )
+    key_parser.add_argument(
+        "--test-profile",
+        type=str,
+        required=True,
+        help="Path to the test profile directory",
+    )
+    key_parser.add_argument(
+        "--install-dir", type=str, required=True, help="Install directory"
+    )
+    key_parser.add_argument(
+        "--extra",
+        type=str,
+        default="",
+        help="Other settings the install and its artefacts depend on",
+    )
+
+    for command, help in [
+        ("restore", "Restore an install and its artefacts (exits with 2 on a miss)"),
+        ("store", "Store an install and its artefacts"),
+    ]:
+        command_parser = subparsers.add_parser(command, help=help)
+        command_parser.add_argument("key", type=str, help="Key of the install")
+        command_parser.add_argument("install_dir", type=str, help="Install directory")
+        command_parser.add_argument("results_dir", type=str, help="Results directory")
+        command_parser.add_argument("test", type=str, help="Test name")
+        command_parser.add_argument("config", type=str, help="Config name")
+        command_parser.add_argument(
+            "flag", type=str, help="Optimization flag, without the dash (e.g. O3)"
+        )
+    args = parser.parse_args()
+
+    if args.command == "key":
+        if not os.path.exists(os.path.join(args.llvm_path, "clang")):
+            print(f"Clang {os.path.join(args.llvm_path, 'clang')} does not exist!")
+            exit(1)
+        if not os.path.isdir(args.toolchain_path):
+            print(f"Toolchain {args.toolchain_path} does not exist!")
+            exit(1)
+        if not os.path.exists(os.path.join(args.test_profile, "test-definition.xml")):
+            print(f"Test profile {args.test_profile} does not exist!")
+            exit(1)
+        print(
+            build_key(
+                args.llvm_path,
+                args.toolchain_path,
+                args.flags,
+                args.opt_flag,
+                args.test_profile,
+                args.install_dir,
+                args.extra,
+            )
+        )
+        exit(0)
+
+    cache = BuildCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    artefacts = [
+        artefact.format(test=args.test, config=args.config, flag=args.flag)
+        for artefact in ARTEFACTS
+    ]
+
+    if args.command == "restore":
+        if not cache.restore(args.key, args.install_dir, args.results_dir, artefacts):
+            print(f"No cached install of {args.test} with {args.config}")
+            exit(2)
+        print(f"Restored {args.test} with {args.config} from {cache.path(args.key)}")
+
+    elif args.command == "store":
+        if not os.path.isdir(args.install_dir):
+            print(f"Install directory {args.install_dir} does not exist!")
+            exit(1)
+        stored = cache.store(args.key, args.install_dir, args.results_dir, artefacts)
+        print(
+            f"Stored {args.test} with {args.config} and {len(stored)} artefacts in {cache.path(args.key)}"
+        )
+        cache.evict()
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+
+import regression_stats
+
+
+def round_times(records_file):
+    # Total compile time of each install round
+    times = {}
+    with open(records_file, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            times[record["round"]] = times.get(record["round"], 0) + record["wall_ms"]
+    return [times[round] for round in sorted(times, key=int)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check whether the install rounds of a test measure its compile time precisely enough"
+    )
+    parser.add_argument(
+        "records_file", type=str, help="Compile records of the test (JSONL)"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=2.0,
+        help="Maximum width of the 95%% confidence interval of the mean compile time (in %% of the mean)",
+    )
+    parser.add_argument(
+        "--min-rounds",
+        type=int,
+        default=3,
+        help="Minimum number of rounds before the interval is trusted",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="JSON file to record the number of rounds and the interval width in",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.records_file):
+        print(f"Records file {args.records_file} does not exist!")
+        exit(1)
+
+    times = round_times(args.records_file)
+    width = regression_stats.relative_ci_width(times) if times else float("nan")
+    converged = len(times) >= args.min_rounds and width <= args.threshold
+    print(
+        f"{len(times)} rounds, confidence interval width {width:.2f}% (target {args.threshold:.2f}%)"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "rounds": len(times),
+                    "ci_width": width,
+                    "threshold": args.threshold,
+                    "converged": bool(converged),
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+
+    # Exit with 0 once precise enough, so that run-all.sh stops adding rounds
+    exit(0 if converged else 2)
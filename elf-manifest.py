@@ -0,0 +1,20 @@
+import argparse
+import os
+
+from elfutils import scan_elf_files, write_manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="List the ELF files of an install directory"
+    )
+    parser.add_argument("install_dir", type=str, help="Install directory")
+    parser.add_argument("manifest_file", type=str, help="Output manifest file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.install_dir):
+        print(f"Install directory {args.install_dir} does not exist!")
+        exit(1)
+
+    print(f"Writing ELF manifest of {args.install_dir} to {args.manifest_file}")
+    write_manifest(args.manifest_file, scan_elf_files(args.install_dir))
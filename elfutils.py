@@ -0,0 +1,284 @@
+import hashlib
+import mmap
+import os
+import struct
+
+ELF_MAGIC = b"\x7fELF"
+
+# Object file types
+ELF_TYPES = {0: "NONE", 1: "REL", 2: "EXEC", 3: "DYN", 4: "CORE"}
+
+# Section types
+SHT_NULL = 0
+SHT_SYMTAB = 2
+SHT_NOTE = 7
+SHT_NOBITS = 8
+SHT_DYNSYM = 11
+
+# Section flags
+SHF_EXECINSTR = 0x4
+
+# Symbol bindings and types
+STB_LOCAL = 0
+STB_GLOBAL = 1
+STT_FUNC = 2
+
+# Note types
+NT_GNU_BUILD_ID = 3
+
+
+class ELFError(Exception):
+    pass
+
+
+def is_elf(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == ELF_MAGIC
+    except OSError:
+        return False
+
+
+class ELFFile:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ELFError(f"{path}: empty file")
+
+        if self.data[:4] != ELF_MAGIC:
+            self.close()
+            raise ELFError(f"{path}: not an ELF file")
+
+        self.is_64 = self.data[4] == 2
+        self.endian = "<" if self.data[5] == 1 else ">"
+
+        if self.is_64:
+            header = self.unpack("HHIQQQIHHHHHH", 16)
+        else:
+            header = self.unpack("HHIIIIIHHHHHH", 16)
+        (
+            self.type,
+            self.machine,
+            _,
+            _,
+            _,
+            self.shoff,
+            _,
+            _,
+            _,
+            _,
+            self.shentsize,
+            self.shnum,
+            self.shstrndx,
+        ) = header
+
+        self.sections = self.read_sections()
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def unpack(self, fmt, offset):
+        fmt = self.endian + fmt
+        try:
+            return struct.unpack_from(fmt, self.data, offset)
+        except struct.error:
+            raise ELFError(f"{self.path}: truncated ELF file")
+
+    def read_sections(self):
+        if self.shoff == 0:
+            return []
+
+        sections = []
+        fmt = "IIQQQQIIQQ" if self.is_64 else "IIIIIIIIII"
+        for i in range(self.shnum):
+            (
+                name,
+                type,
+                flags,
+                addr,
+                offset,
+                size,
+                link,
+                info,
+                addralign,
+                entsize,
+            ) = self.unpack(fmt, self.shoff + i * self.shentsize)
+            sections.append(
+                {
+                    "name": name,
+                    "type": type,
+                    "flags": flags,
+                    "offset": offset,
+                    "size": size,
+                    "link": link,
+                    "entsize": entsize,
+                }
+            )
+
+        # Resolve section names from the section header string table
+        if self.shstrndx < len(sections):
+            strtab = sections[self.shstrndx]
+            for section in sections:
+                section["name"] = self.string(strtab, section["name"])
+
+        return sections
+
+    def string(self, strtab, offset):
+        start = strtab["offset"] + offset
+        end = self.data.find(b"\0", start, strtab["offset"] + strtab["size"])
+        if end < 0:
+            return ""
+        return self.data[start:end].decode("utf-8", errors="replace")
+
+    def section(self, name):
+        for section in self.sections:
+            if section["name"] == name:
+                return section
+        return None
+
+    def build_id(self):
+        for section in self.sections:
+            if section["type"] != SHT_NOTE:
+                continue
+
+            # Walk the notes of the section: namesz, descsz, type, name, desc
+            offset = section["offset"]
+            end = offset + section["size"]
+            while offset + 12 <= end:
+                namesz, descsz, type = self.unpack("III", offset)
+                name_start = offset + 12
+                desc_start = name_start + (namesz + 3) // 4 * 4
+                desc_end = desc_start + descsz
+                name = self.data[name_start : name_start + namesz].rstrip(b"\0")
+                if type == NT_GNU_BUILD_ID and name == b"GNU":
+                    return self.data[desc_start:desc_end].hex()
+                offset = desc_start + (descsz + 3) // 4 * 4
+
+        return None
+
+    def section_sizes(self):
+        # Bytes taken in the file by each section, attributing the remainder
+        # (ELF header, program headers, section headers and padding) to
+        # "(headers/padding)"
+        total = 0
+        for section in self.sections:
+            if section["type"] in (SHT_NULL, SHT_NOBITS):
+                continue
+            total += section["size"]
+            yield section["name"], section["size"]
+
+        yield "(headers/padding)", max(0, len(self.data) - total)
+
+    def is_text_section(self, index):
+        if index >= len(self.sections):
+            return False
+        section = self.sections[index]
+        return section["flags"] & SHF_EXECINSTR and (
+            section["name"] == ".text" or section["name"].startswith(".text.")
+        )
+
+    def function_symbols(self):
+        # Read .symtab, falling back to .dynsym for stripped binaries
+        symtab = None
+        for type in (SHT_SYMTAB, SHT_DYNSYM):
+            symtab = next((s for s in self.sections if s["type"] == type), None)
+            if symtab is not None:
+                break
+        if symtab is None or symtab["link"] >= len(self.sections):
+            return
+
+        strtab = self.sections[symtab["link"]]
+        fmt = self.endian + ("IBBHQQ" if self.is_64 else "IIIBBH")
+        entsize = struct.calcsize(fmt)
+        start = symtab["offset"]
+        end = start + symtab["size"] // entsize * entsize
+        if end > len(self.data):
+            raise ELFError(f"{self.path}: truncated symbol table")
+
+        text_sections = {}
+        for entry in struct.iter_unpack(fmt, self.data[start:end]):
+            if self.is_64:
+                name, info, _, shndx, _, size = entry
+            else:
+                name, _, size, info, _, shndx = entry
+
+            # Local and global functions with a size, as nm reports with t/T
+            if size == 0 or info & 0xF != STT_FUNC or info >> 4 not in (
+                STB_LOCAL,
+                STB_GLOBAL,
+            ):
+                continue
+            if shndx not in text_sections:
+                text_sections[shndx] = self.is_text_section(shndx)
+            if not text_sections[shndx]:
+                continue
+
+            yield self.string(strtab, name), size
+
+
+def build_id(path):
+    try:
+        with ELFFile(path) as elf:
+            return elf.build_id()
+    except ELFError:
+        return None
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_key(path, build=None):
+    # Content-addressed key of a binary, preferring the (cheap) GNU build-id
+    build = build or build_id(path)
+    if build:
+        return f"build-id-{build}"
+    return f"sha256-{sha256(path)}"
+
+
+def scan_elf_files(install_dir):
+    # Walk the install tree once, detecting ELF files by their magic bytes
+    for root, dirs, files in os.walk(install_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if os.path.islink(path) or not is_elf(path):
+                continue
+
+            try:
+                with ELFFile(path) as elf:
+                    type = ELF_TYPES.get(elf.type, str(elf.type))
+                    build = elf.build_id()
+            except ELFError:
+                type, build = "INVALID", None
+
+            yield path, os.path.getsize(path), type, build
+
+
+def write_manifest(manifest_file, entries):
+    # One line per ELF file: path, size, type and build-id ("-" if missing)
+    with open(manifest_file, "w") as f:
+        for path, size, type, build in entries:
+            f.write(f"{path}\t{size}\t{type}\t{build or '-'}\n")
+
+
+def read_manifest(manifest_file):
+    entries = []
+    with open(manifest_file, "r") as f:
+        for line in f:
+            path, size, type, build = line.rstrip("\n").split("\t")
+            entries.append((path, int(size), type, None if build == "-" else build))
+    return entries
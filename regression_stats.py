@@ -0,0 +1,245 @@
+import math
+
+import numpy as np
+
+RESAMPLES = 10000
+CONFIDENCE = 0.95
+ALPHA = 0.05
+
+# Changes are relative to the baseline and positive when they are regressions:
+# the ratio of the means of the new and the baseline samples minus one (or of
+# the baseline and the new samples, when higher is better)
+
+
+def relative_change(base, other, higher_is_better=False):
+    if higher_is_better:
+        return base / other - 1
+    return other / base - 1
+
+
+def bootstrap_means(samples, resamples, rng):
+    # Means of all the resamples of the samples at once
+    index = rng.integers(0, len(samples), size=(resamples, len(samples)))
+    return samples[index].mean(axis=1)
+
+
+def valid_pairs(pairs):
+    return [
+        (np.asarray(base, dtype=np.float64), np.asarray(other, dtype=np.float64), hib)
+        for base, other, hib in pairs
+        if len(base) > 0 and len(other) > 0
+    ]
+
+
+def bootstrap_change(pairs, resamples, rng):
+    # Mean relative change over the (base, other, higher_is_better) sample
+    # pairs of a test, e.g. its benchmarks, and its bootstrap distribution,
+    # resampling the samples of each pair independently
+    changes = np.zeros(resamples)
+    for base, other, higher_is_better in pairs:
+        changes += relative_change(
+            bootstrap_means(base, resamples, rng),
+            bootstrap_means(other, resamples, rng),
+            higher_is_better,
+        )
+    changes /= len(pairs)
+
+    change = np.mean(
+        [
+            relative_change(base.mean(), other.mean(), higher_is_better)
+            for base, other, higher_is_better in pairs
+        ]
+    )
+    return float(change), changes
+
+
+def interval(changes, confidence):
+    # Percentile bootstrap confidence interval
+    low, high = np.percentile(
+        changes, [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+    )
+    return float(low), float(high)
+
+
+def rank(values):
+    # Ranks starting at 1, averaged over ties
+    order = np.argsort(values, kind="stable")
+    _, first, counts = np.unique(values[order], return_index=True, return_counts=True)
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(first + (counts + 1) / 2, counts)
+    return ranks, counts
+
+
+def normal_p_value(deviation, variance):
+    # Two-sided p-value of a deviation from the mean of a rank statistic, with
+    # the normal approximation (with continuity correction)
+    if variance <= 0:
+        return 1.0
+    z = max(abs(deviation) - 0.5, 0) / math.sqrt(variance)
+    return min(1.0, math.erfc(z / math.sqrt(2)))
+
+
+def mann_whitney_min_p(n1, n2):
+    # Smallest p-value the Mann-Whitney U test can reach with these sample
+    # sizes (without ties), e.g. about 0.081 with 3 samples of each
+    return normal_p_value(n1 * n2 / 2, n1 * n2 / 12 * (n1 + n2 + 1))
+
+
+def wilcoxon_min_p(n):
+    # Smallest p-value the signed-rank test can reach with n nonzero
+    # differences (without ties)
+    return normal_p_value(n * (n + 1) / 4, n * (n + 1) * (2 * n + 1) / 24)
+
+
+def mann_whitney_u(x, y):
+    # Two-sided Mann-Whitney U test, with the normal approximation (with
+    # continuity and tie corrections)
+    n1, n2 = len(x), len(y)
+    n = n1 + n2
+    ranks, counts = rank(np.concatenate([x, y]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+
+    ties = (counts**3 - counts).sum()
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    return float(u), normal_p_value(u - n1 * n2 / 2, variance)
+
+
+def wilcoxon_signed_rank(differences):
+    # Two-sided Wilcoxon signed-rank test of paired differences, with the
+    # normal approximation (with continuity and tie corrections, dropping zeros)
+    differences = differences[differences != 0]
+    n = len(differences)
+    if n == 0:
+        return 0.0, 1.0
+
+    ranks, counts = rank(np.abs(differences))
+    w = ranks[differences > 0].sum()
+
+    ties = (counts**3 - counts).sum()
+    variance = n * (n + 1) * (2 * n + 1) / 24 - ties / 48
+    return float(w), normal_p_value(w - n * (n + 1) / 4, variance)
+
+
+def verdict(low, high, p_value, alpha=ALPHA, min_p_value=0.0):
+    # The p-value only decides when it can get under alpha with the sample
+    # sizes of the test (not with 3 samples of each config, the default number
+    # of rounds and runs), and the confidence interval alone decides otherwise
+    significant = p_value < alpha or min_p_value >= alpha
+    if significant and low > 0:
+        return "regressed"
+    if significant and high < 0:
+        return "improved"
+    return "inconclusive"
+
+
+def compare(pairs, resamples=RESAMPLES, confidence=CONFIDENCE, alpha=ALPHA):
+    # Relative change (in %), its confidence interval, the p-value and the
+    # verdict of a test, from its (base, other, higher_is_better) sample pairs.
+    # The p-value of a test with several pairs is the smallest one, with the
+    # Bonferroni correction
+    pairs = valid_pairs(pairs)
+    if not pairs:
+        nan = float("nan")
+        return nan, nan, nan, nan, "inconclusive"
+
+    rng = np.random.default_rng(0)
+    change, changes = bootstrap_change(pairs, resamples, rng)
+    low, high = interval(changes, confidence)
+    p_value = min(
+        1.0,
+        len(pairs) * min(mann_whitney_u(base, other)[1] for base, other, _ in pairs),
+    )
+    min_p_value = min(
+        1.0,
+        len(pairs)
+        * min(mann_whitney_min_p(len(base), len(other)) for base, other, _ in pairs),
+    )
+    return (
+        change * 100,
+        low * 100,
+        high * 100,
+        p_value,
+        verdict(low, high, p_value, alpha, min_p_value),
+    )
+
+
+def compare_paired(pairs, resamples=RESAMPLES, confidence=CONFIDENCE, alpha=ALPHA):
+    # Same as compare, for (base, other, higher_is_better) pairs of trial
+    # means, where the i-th base and other trials were run back to back. The
+    # relative change of each trial is resampled, and tested for a nonzero
+    # median with the signed-rank test
+    pairs = [
+        (np.asarray(base, dtype=np.float64), np.asarray(other, dtype=np.float64), hib)
+        for base, other, hib in pairs
+        if len(base) > 0 and len(base) == len(other)
+    ]
+    if not pairs:
+        nan = float("nan")
+        return nan, nan, nan, nan, "inconclusive"
+
+    rng = np.random.default_rng(0)
+    trial_changes = [relative_change(base, other, hib) for base, other, hib in pairs]
+    change = np.mean([changes.mean() for changes in trial_changes])
+    changes = np.mean(
+        [bootstrap_means(changes, resamples, rng) for changes in trial_changes], axis=0
+    )
+    low, high = interval(changes, confidence)
+    p_value = min(
+        1.0,
+        len(pairs) * min(wilcoxon_signed_rank(changes)[1] for changes in trial_changes),
+    )
+    min_p_value = min(
+        1.0,
+        len(pairs)
+        * min(
+            wilcoxon_min_p(np.count_nonzero(changes)) for changes in trial_changes
+        ),
+    )
+    return (
+        float(change) * 100,
+        low * 100,
+        high * 100,
+        p_value,
+        verdict(low, high, p_value, alpha, min_p_value),
+    )
+
+
+def geomean_change(tests, weights=None, resamples=RESAMPLES, confidence=CONFIDENCE):
+    # Change (in %) of the weighted geometric mean of the ratios of the tests
+    # (one plus their relative change), e.g. over a suite, with its confidence
+    # interval and the number of tests, from the sample pairs of each test
+    rng = np.random.default_rng(0)
+    log_ratio = 0.0
+    log_ratios = np.zeros(resamples)
+    total_weight = 0.0
+    count = 0
+    for test in sorted(tests):
+        pairs = valid_pairs(tests[test])
+        weight = 1.0 if weights is None else weights.get(test, 1.0)
+        if not pairs or weight <= 0:
+            continue
+
+        change, changes = bootstrap_change(pairs, resamples, rng)
+        if not change > -1:
+            continue
+        log_ratio += weight * math.log1p(change)
+        log_ratios += weight * np.log1p(np.maximum(changes, -1 + 1e-12))
+        total_weight += weight
+        count += 1
+
+    if count == 0:
+        nan = float("nan")
+        return nan, nan, nan, 0
+
+    change = math.expm1(log_ratio / total_weight)
+    low, high = interval(np.expm1(log_ratios / total_weight), confidence)
+    return change * 100, low * 100, high * 100, count
+
+
+def relative_ci_width(samples, resamples=RESAMPLES, confidence=CONFIDENCE):
+    # Width of the bootstrap confidence interval of the mean of the samples,
+    # relative to the mean (in %)
+    samples = np.asarray(samples, dtype=np.float64)
+    rng = np.random.default_rng(0)
+    low, high = interval(bootstrap_means(samples, resamples, rng), confidence)
+    return (high - low) / samples.mean() * 100
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Flags that write side outputs (dependency files and time traces)
+DROPPED_FLAGS = ("-MD", "-MMD")
+DROPPED_FLAGS_WITH_VALUE = ("-MF", "-MT", "-MQ")
+DROPPED_PREFIXES = ("-MF", "-MT", "-MQ", "-Wp,-M", "-ftime-trace")
+
+
+def read_records(records_file):
+    with open(records_file, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def parse_cpus(cpus):
+    # CPU list in taskset format, e.g. "2-5,8"
+    result = []
+    for part in cpus.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            result.extend(range(int(start), int(end) + 1))
+        else:
+            result.append(int(part))
+    return result
+
+
+def remap(path, root_map):
+    for old, new in root_map:
+        path = path.replace(old, new)
+    return path
+
+
+def replay_command(record, llvm_path, root_map):
+    # Rebuild a compile-only command for another compiler, discarding the
+    # object file and the side outputs so that the original build is untouched
+    argv = [os.path.join(llvm_path, os.path.basename(record["argv"][0]))]
+    args = iter(record["argv"][1:])
+    for arg in args:
+        if arg == "-o":
+            next(args, None)
+            argv.extend(["-o", "/dev/null"])
+        elif arg in DROPPED_FLAGS:
+            continue
+        elif arg in DROPPED_FLAGS_WITH_VALUE:
+            next(args, None)
+        elif arg.startswith(DROPPED_PREFIXES):
+            continue
+        else:
+            argv.append(remap(arg, root_map))
+
+    return remap(record["cwd"], root_map), argv
+
+
+def compiles(records):
+    # Successful compiles (-c) of a source file, from the first recorded round
+    records = [
+        record
+        for record in records
+        if record["exit_code"] == 0 and record["input"] and "-c" in record["argv"]
+    ]
+    if not records:
+        return []
+
+    first_round = min(records, key=lambda record: int(record["round"]))["round"]
+    return [record for record in records if record["round"] == first_round]
+
+
+def run(cwd, argv):
+    start = time.monotonic_ns()
+    process = subprocess.Popen(
+        argv, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # Measure the compiler process itself with wait4
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall_ns = time.monotonic_ns() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    return process.returncode, {
+        "wall_ms": wall_ns / 1e6,
+        "user_ms": rusage.ru_utime * 1000,
+        "sys_ms": rusage.ru_stime * 1000,
+        "maxrss_kb": rusage.ru_maxrss,
+    }
+
+
+def pin_worker(cpus, lock):
+    # Pin the worker thread to its own CPU, inherited by the compilers it spawns
+    with lock:
+        cpu = cpus.pop(0)
+        cpus.append(cpu)
+    os.sched_setaffinity(0, {cpu})
+
+
+def replay(record, config, round, llvm_path, root_map):
+    cwd, argv = replay_command(record, llvm_path, root_map)
+    exit_code, usage = run(cwd, argv)
+    return {
+        "test": record["test"],
+        "config": config,
+        "round": str(round),
+        "cwd": cwd,
+        "argv": argv,
+        "input": record["input"],
+        "wall_ms": usage["wall_ms"],
+        "user_ms": usage["user_ms"],
+        "sys_ms": usage["sys_ms"],
+        "cpu_ms": usage["user_ms"] + usage["sys_ms"],
+        "maxrss_kb": usage["maxrss_kb"],
+        "exit_code": exit_code,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay the recorded compiles of a test with another compiler and time them"
+    )
+    parser.add_argument(
+        "records_file", type=str, help="Compile records of the test (JSONL)"
+    )
+    parser.add_argument("output_file", type=str, help="Output compile records (JSONL)")
+    parser.add_argument(
+        "llvm_path", type=str, help="Directory with the clang and clang++ binaries"
+    )
+    parser.add_argument(
+        "-c",
+        "--config",
+        type=str,
+        default=None,
+        help="Config name of the records (defaults to the name in the input records)",
+    )
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=10, help="Number of replay rounds"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of parallel compiles"
+    )
+    parser.add_argument(
+        "--cpus",
+        type=str,
+        default=None,
+        help="CPUs to pin the workers to, one per worker (e.g. 2-5,8)",
+    )
+    parser.add_argument(
+        "--root-map",
+        type=str,
+        action="append",
+        default=[],
+        metavar="OLD=NEW",
+        help="Replace a path prefix in the working directories and arguments (e.g. to replay in a snapshot)",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.records_file):
+        print(f"Records file {args.records_file} does not exist!")
+        exit(1)
+
+    if not os.path.isdir(args.llvm_path):
+        print(f"LLVM directory {args.llvm_path} does not exist!")
+        exit(1)
+
+    llvm_path = os.path.abspath(args.llvm_path)
+    root_map = [tuple(mapping.split("=", 1)) for mapping in args.root_map]
+    records = compiles(read_records(args.records_file))
+    if not records:
+        print(f"No compiles to replay in {args.records_file}")
+        exit(1)
+    config = args.config or records[0]["config"]
+
+    initializer, initargs = None, ()
+    if args.cpus:
+        initializer, initargs = pin_worker, (parse_cpus(args.cpus), threading.Lock())
+
+    print(
+        f"Replaying {len(records)} compiles {args.rounds} times with {llvm_path}"
+    )
+    print(f"Writing compile records to {args.output_file}")
+    failed = 0
+    with open(args.output_file, "w") as f, ThreadPoolExecutor(
+        max_workers=args.jobs, initializer=initializer, initargs=initargs
+    ) as executor:
+        for round in range(1, args.rounds + 1):
+            start = time.monotonic()
+            for result in executor.map(
+                lambda record: replay(
+                    record, config, round, llvm_path, root_map
+                ),
+                records,
+            ):
+                # Leave failed compiles out, so that they are not timed
+                if result["exit_code"] != 0:
+                    failed += 1
+                    continue
+                f.write(json.dumps(result) + "\n")
+            print(f"Round {round}/{args.rounds}: {time.monotonic() - start:.2f}s")
+
+    if failed:
+        print(f"{failed} replayed compiles failed, and were left out of the records!")
+        exit(1)
@@ -1,11 +1,27 @@
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
 import os
 import xml.etree.ElementTree as ET
 import argparse
+import functools
+import hashlib
+import json
+import multiprocessing
+import pickle
 import re
-from matplotlib.ticker import AutoMinorLocator
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import results_store
+
+
+def pyplot():
+    # Plots are only written to files, so select the non-interactive backend
+    # before pyplot is first imported
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
 
 BACKGROUND = "#F6F8FA"
 BLACK = "#24292E"
@@ -25,125 +41,477 @@ RED = "#D73A49"
 WHITE = "#6A737D"
 YELLOW = "#B08800"
 
+# Bump when the parsed contribution of a results file changes
+CACHE_VERSION = "v5"
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "phoronix-benchmark-infra",
+    "extract",
+)
+
+# Extraction cache, set in __main__ (None disables caching)
+CACHE = None
+
+# Tests to extract, set in __main__ (None extracts every test)
+TESTS = None
+
+# Whether to write the statistics, the suite summary and the results store,
+# set in __main__ (a CSV-only run only writes the results CSVs)
+STORE = True
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = os.path.join(cache_dir, CACHE_VERSION)
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, parse, results_file):
+        # One entry per results file and parser, as some files feed several
+        # extractors
+        key = f"{parse.__qualname__}:{os.path.abspath(results_file)}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def load(self, path, key):
+        try:
+            with open(path, "rb") as f:
+                entry_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if entry_key != key:
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        return value
+
+    def store(self, path, key, value):
+        # Write atomically, as several workers may store entries concurrently
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def get(self, parse, results_file):
+        # Only parse results files that are new or changed since the last run
+        stat = os.stat(results_file)
+        key = (os.path.abspath(results_file), stat.st_mtime_ns, stat.st_size)
+        path = self.path(parse, results_file)
+        value = self.load(path, key)
+        if value is None:
+            value = parse(results_file)
+            self.store(path, key, value)
+        return value
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits its size cap
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            os.remove(path)
+            total -= size
+
+
+def cached(parse, results_file):
+    if CACHE is None:
+        return parse(results_file)
+    return CACHE.get(parse, results_file)
+
+
+def content_hash(value, digest):
+    # Hash values by content, as pickles of equal objects (e.g. strings that
+    # are or are not shared) may differ
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), list(map(str, value.dtypes)))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(pd.util.hash_array(value.ravel()).tobytes())
+    elif isinstance(value, dict):
+        content_hash(list(value.items()), digest)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            content_hash(item, digest)
+    else:
+        digest.update(repr(value).encode())
+
+
+@functools.lru_cache(maxsize=None)
+def plot_parameters():
+    # Plots are also redrawn when this script or matplotlib change
+    import matplotlib
+
+    with open(__file__, "rb") as f:
+        source = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return source, matplotlib.__version__
+
+
+def plot_hash(extractor, plot, plot_file):
+    digest = hashlib.blake2b(digest_size=16)
+    content_hash(
+        (plot.__qualname__, os.path.basename(plot_file), FLAG, plot_parameters()),
+        digest,
+    )
+    content_hash(extractor.plot_inputs(), digest)
+    return digest.hexdigest()
+
+
+def render_plot(extractor, plot, results_file, plot_file):
+    if CACHE is None:
+        plot(results_file, os.path.dirname(plot_file))
+        return
+
+    # Skip the plot if it was rendered from the same inputs, and is unchanged
+    path = CACHE.path(plot, plot_file)
+    digest = plot_hash(extractor, plot, plot_file)
+    if os.path.exists(plot_file):
+        stat = os.stat(plot_file)
+        key = (os.path.abspath(plot_file), stat.st_mtime_ns, stat.st_size)
+        if CACHE.load(path, key) == digest:
+            print(f"Skipping unchanged plot {plot_file}")
+            return
+
+    plot(results_file, os.path.dirname(plot_file))
+    stat = os.stat(plot_file)
+    key = (os.path.abspath(plot_file), stat.st_mtime_ns, stat.st_size)
+    CACHE.store(path, key, digest)
+
+
+# Regression statistics of each test, for extractors with samples
+STATS_COLUMNS = ["Test", "Change", "Low", "High", "P-Value", "Verdict"]
+VERDICT_COLORS = {
+    "improved": BRIGHTGREEN,
+    "regressed": BRIGHTRED,
+    "inconclusive": BRIGHTYELLOW,
+}
+
+
+def verdict_legend(ax, colors):
+    from matplotlib.patches import Patch
+
+    ax.legend(
+        handles=[
+            Patch(facecolor=color, edgecolor="black", label=verdict.capitalize())
+            for verdict, color in colors.items()
+        ],
+        loc="lower right",
+        fontsize=10,
+        frameon=True,
+        framealpha=1,
+    )
+
 
 class ResultsExtractor:
-    def __init__(self, results_dir):
+    # Dataset of the results in the results store, and its columns
+    metric = None
+    columns = None
+
+    def __init__(self, results_dir, executor=None):
         self.results_dir = results_dir
+        self.executor = executor
         self.compute_results()
 
     def compute_results(self, results_dir):
         pass
 
-    def write_results(self, results, results_file):
-        pass
+    def map_tests(self, metric, compute_test, by_test=True, **kwargs):
+        # Compute the results of each test directory of a metric (only of the
+        # selected tests, if any), in the process pool if there is one
+        tests = sorted(os.listdir(os.path.join(self.results_dir, metric)))
+        if by_test and TESTS is not None:
+            tests = [test for test in tests if test in TESTS]
+        compute = functools.partial(compute_test, self.results_dir, **kwargs)
+        if self.executor is None:
+            return list(map(compute, tests))
+        return list(self.executor.map(compute, tests))
+
+    def to_frame(self):
+        return pd.DataFrame(self.results, columns=self.columns)
+
+    def load_results(self):
+        df = results_store.load_run(self.results_dir)[self.metric]
+        df = df[df["Flag"] == FLAG]
+        return df[self.columns].reset_index(drop=True)
+
+    def write_results(self, results_file):
+        # Store the results, and write the CSV as a view of them
+        df = self.to_frame()
+        if STORE:
+            results_store.write_metric(
+                self.results_dir, self.metric, df.assign(Flag=FLAG)
+            )
+        results_store.export_csv(df, results_file)
+
+    def pairs(self):
+        # (base, byte, higher is better) sample pairs of each test
+        return {}
+
+    def compare(self):
+        # Regression statistics of each test (rows of STATS_COLUMNS)
+        import regression_stats
+
+        return [
+            (test,) + regression_stats.compare(pairs)
+            for test, pairs in sorted(self.pairs().items())
+        ]
+
+    def load_stats(self):
+        df = results_store.load_run(self.results_dir)[f"{self.metric}-stats"]
+        df = df[df["Flag"] == FLAG]
+        return df[STATS_COLUMNS].set_index("Test")
+
+    def write_stats(self, stats_file):
+        if not STORE:
+            return
+        print(f"Writing {self.metric} statistics to {stats_file}")
+        df = pd.DataFrame(self.compare(), columns=STATS_COLUMNS)
+        results_store.write_metric(
+            self.results_dir, f"{self.metric}-stats", df.assign(Flag=FLAG)
+        )
+        results_store.export_csv(df, stats_file)
 
     def merge_results(self, results_file):
         pass
 
+    def plot_inputs(self):
+        # Data the plots are drawn from, hashed to skip unchanged plots
+        return self.load_results()
+
+    def plots(self):
+        # Plot files of the extractor, each rendered by its own worker
+        return {f"{self.metric}.svg": self.plot_results}
+
     def plot_results(self, results_file, plot_dir):
         pass
 
 
 class RuntimeResultsExtractor(ResultsExtractor):
+    metric = "runtime"
+    columns = [
+        "Test",
+        "Description",
+        "Scale",
+        "Proportion",
+        "Profile",
+        "Value",
+        "StdDev",
+        "RSD",
+    ]
+
     def compute_results(self):
         self.results = []
+        # Raw samples of each (test, description, profile), for statistics,
+        # and of each of its trials when the profiles were run interleaved
+        self.samples = {}
+        self.trials = {}
+        # Results are kept per host, and filtered by test once parsed
+        for results, samples, trials in self.map_tests(
+            "test-results", self.compute_test, by_test=False
+        ):
+            self.results += results
+            for result, sample, trial_samples in zip(results, samples, trials):
+                self.samples[(result[0], result[1], result[4])] = sample
+                if trial_samples:
+                    self.trials[(result[0], result[1], result[4])] = trial_samples
 
-        for test in os.listdir(self.results_dir + "/test-results"):
-            path = os.path.join(
-                self.results_dir + "/test-results",
-                test,
-                FLAG,
-                "composite.xml",
-            )
-            tree = ET.parse(path)
-            root = tree.getroot()
+        self.results.sort(key=lambda x: (x[0], x[4], x[1]))
 
-            for result in root.findall(".//Result"):
-                identifier = result.find("Identifier").text
-                identifier = identifier.replace("local/", "")
-                description = result.find("Description").text or "No description"
-                scale = result.find("Scale").text
-                proportion = result.find("Proportion").text
-                for entry in result.findall(".//Data/Entry"):
-                    profile = entry.find("Identifier").text
-                    value = entry.find("Value").text or float("nan")
-
-                    # Calculate standard deviation from raw string
-                    std_dev = 0.0
-                    rawstring = entry.find("RawString").text
-                    raw_values = [float(val.strip()) for val in rawstring.split(":")]
-
-                    # Calculate mean
-                    mean_value = sum(raw_values) / len(raw_values) if raw_values else 0
-
-                    # Calculate standard deviation using the formula: σ = √(1/N * Σ(x_i - x̄)²)
-                    if raw_values:
-                        squared_diff_sum = sum(
-                            (x - mean_value) ** 2 for x in raw_values
-                        )
-                        std_dev = (squared_diff_sum / len(raw_values)) ** 0.5
-
-                    # Calculate RSD: RSD (%) = (σ / x̄) * 100
-                    rsd = (std_dev / mean_value * 100) if mean_value != 0 else 0
-
-                    self.results.append(
-                        (
-                            identifier,
-                            description,
-                            scale,
-                            proportion,
-                            profile,
-                            value,
-                            std_dev,
-                            rsd,
-                        )
-                    )
+    @staticmethod
+    def compute_test(results_dir, test):
+        path = os.path.join(
+            results_dir + "/test-results",
+            test,
+            FLAG,
+            "composite.xml",
+        )
+        results, samples, trials = cached(RuntimeResultsExtractor.parse_file, path)
+        if TESTS is None:
+            return results, samples, trials
+
+        # Only keep the selected tests (by name, with or without their version,
+        # e.g. z3-1.0), as the others may have been run with one config only
+        selected = [
+            i
+            for i, result in enumerate(results)
+            if result[0] in TESTS or re.sub(r"-\d+(\.\d+)*$", "", result[0]) in TESTS
+        ]
+        return (
+            [results[i] for i in selected],
+            [samples[i] for i in selected],
+            [trials[i] for i in selected],
+        )
 
-        self.results.sort(key=lambda x: (x[0], x[4], x[1]))
+    @staticmethod
+    def parse_file(path):
+        entries = []
+        samples = []
+        trials = []
+        positions = {}
+
+        # Stream the results, dropping each one once its entries are read
+        root = None
+        for event, element in ET.iterparse(path, events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end" or element.tag != "Result":
+                continue
 
-    def write_results(self, results_file):
-        print(f"Writing runtime results to {results_file}")
-        with open(results_file, "w") as f:
-            f.write("Test;Description;Scale;Proportion;Profile;Value;StdDev;RSD\n")
-            for (
-                test,
-                description,
-                scale,
-                proportion,
-                profile,
-                value,
-                std_dev,
-                rsd,
-            ) in self.results:
-                f.write(
-                    f"{test};{description};{scale};{proportion};{profile};{value};{std_dev};{rsd}\n"
+            identifier = element.findtext("Identifier").replace("local/", "")
+            description = element.findtext("Description") or "No description"
+            scale = element.findtext("Scale")
+            proportion = element.findtext("Proportion")
+            for entry in element.iterfind(".//Data/Entry"):
+                # Interleaved runs are identified by profile@trial
+                profile, _, trial = entry.findtext("Identifier").partition("@")
+                value = entry.findtext("Value") or float("nan")
+                rawstring = entry.findtext("RawString") or ""
+                sample = np.array(
+                    [val for val in rawstring.split(":") if val.strip()],
+                    dtype=np.float64,
                 )
 
+                key = (identifier, description, scale, proportion, profile)
+                if key not in positions:
+                    positions[key] = len(entries)
+                    entries.append(key + (value,))
+                    samples.append([])
+                    trials.append({})
+                samples[positions[key]].append(sample)
+                if trial:
+                    trials[positions[key]][trial] = sample
+            root.clear()
+
+        # Samples of all the trials of each entry
+        samples = [
+            np.concatenate(sample) if len(sample) > 1 else sample[0]
+            for sample in samples
+        ]
+
+        # Mean, standard deviation (σ = √(1/N * Σ(x_i - x̄)²)) and RSD
+        # (σ / x̄ * 100) of all entries at once
+        counts = np.array([len(sample) for sample in samples], dtype=np.int64)
+        values = np.concatenate(samples) if samples else np.empty(0)
+        index = np.repeat(np.arange(len(samples)), counts)
+        zeros = np.zeros(len(samples))
+        mean = np.divide(
+            np.bincount(index, weights=values, minlength=len(samples)),
+            counts,
+            out=zeros.copy(),
+            where=counts > 0,
+        )
+        squared_diff_sum = np.bincount(
+            index, weights=(values - mean[index]) ** 2, minlength=len(samples)
+        )
+        std_dev = np.sqrt(
+            np.divide(squared_diff_sum, counts, out=zeros.copy(), where=counts > 0)
+        )
+        rsd = np.divide(std_dev * 100, mean, out=zeros.copy(), where=mean != 0)
+
+        # The value of interleaved entries is the mean of all their trials
+        results = [
+            (entry[:5] + (float(average),) if trial_samples else entry)
+            + (float(std), float(relative))
+            for entry, average, std, relative, trial_samples in zip(
+                entries, mean, std_dev, rsd, trials
+            )
+        ]
+        return results, samples, trials
+
+    def to_frame(self):
+        df = super().to_frame()
+        df["Value"] = pd.to_numeric(df["Value"])
+        return df
+
+    def pairs(self):
+        # Raw samples of the benchmarks of each test, oriented by their
+        # proportion (HIB or LIB)
+        pairs = {}
+        for test, description, _, proportion, profile, *_ in self.results:
+            if profile != "base" or (test, description, "byte") not in self.samples:
+                continue
+            pairs.setdefault(test, []).append(
+                (
+                    self.samples[(test, description, "base")],
+                    self.samples[(test, description, "byte")],
+                    proportion == "HIB",
+                )
+            )
+        return pairs
+
+    def trial_pairs(self):
+        # Means of the trials of the benchmarks of each test run interleaved,
+        # where the trials with the same identifier were run back to back
+        pairs = {}
+        for test, description, _, proportion, profile, *_ in self.results:
+            base = self.trials.get((test, description, "base"))
+            byte = self.trials.get((test, description, "byte"))
+            if profile != "base" or not base or not byte:
+                continue
+            common = [
+                trial
+                for trial in sorted(set(base) & set(byte))
+                if len(base[trial]) > 0 and len(byte[trial]) > 0
+            ]
+            pairs.setdefault(test, []).append(
+                (
+                    np.array([base[trial].mean() for trial in common]),
+                    np.array([byte[trial].mean() for trial in common]),
+                    proportion == "HIB",
+                )
+            )
+        return pairs
+
+    def compare(self):
+        # Tests run interleaved are compared trial by trial
+        import regression_stats
+
+        trial_pairs = self.trial_pairs()
+        return [
+            (test,)
+            + (
+                regression_stats.compare_paired(trial_pairs[test])
+                if test in trial_pairs
+                else regression_stats.compare(pairs)
+            )
+            for test, pairs in sorted(self.pairs().items())
+        ]
+
+    def write_results(self, results_file, stats_file):
+        print(f"Writing runtime results to {results_file}")
+        super().write_results(results_file)
+        self.write_stats(stats_file)
+
+    def plot_inputs(self):
+        return self.load_results(), self.load_stats()
+
     def merge_results(self, results_file):
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         pivot_table = df.pivot_table(
             index=["Test", "Description", "Scale", "Proportion"],
             columns="Profile",
             values="Value",
+            observed=True,
         )
         pivot_table.to_csv(results_file, sep=";")
 
     def plot_results(self, results_file, plot_dir):
+        plt = pyplot()
+        from matplotlib.ticker import AutoMinorLocator
+
         plot_file = f"{plot_dir}/runtime.svg"
         print(f"Plotting runtime results to {plot_file}")
 
         # Read the data once
-        df = pd.read_csv(results_file, sep=";")
-
-        # Create dictionaries for standard deviation, RSD, and mean values by test and profile
-        std_dev_data = {}
-        rsd_data = {}
-        mean_data = {}
-        for _, row in df.iterrows():
-            key = (row["Test"], row["Profile"])
-            std_dev_data[key] = row["StdDev"]
-            rsd_data[key] = row["RSD"]
-            mean_data[key] = row["Value"]
+        df = self.load_results()
+        stats = self.load_stats()
 
         num_tests = len(df["Test"].unique())
         height = max(6, 0.5 * num_tests)
@@ -155,6 +523,7 @@ class RuntimeResultsExtractor(ResultsExtractor):
             index=("Test", "Description", "Scale", "Proportion"),
             columns="Profile",
             values="Value",
+            observed=True,
         ).reset_index()
         df_pivot.sort_values(by="Test", ascending=False, inplace=True)
 
@@ -170,68 +539,72 @@ class RuntimeResultsExtractor(ResultsExtractor):
         df_pivot["Percentage"] = df_percentage
 
         # Group by Test and calculate the average percentage regression
-        avg_percentage = df_pivot.groupby("Test")["Percentage"].mean().reset_index()
+        avg_percentage = (
+            df_pivot.groupby("Test", observed=True)["Percentage"].mean().reset_index()
+        )
         avg_percentage.set_index("Test", inplace=True)
         avg_percentage.sort_values(by="Test", inplace=True, ascending=False)
         avg_percentage["Percentage"] = avg_percentage["Percentage"].astype(float)
 
-        # Set colors based on regression percentage
-        colors = [
-            GREEN if percentage < 0 else RED
-            for percentage in avg_percentage["Percentage"]
-        ]
+        # Set colors based on the verdict of each test
+        verdicts = stats["Verdict"].astype(object).reindex(avg_percentage.index).fillna("inconclusive")
+        bar_colors = {"improved": GREEN, "regressed": RED, "inconclusive": BRIGHTWHITE}
+        colors = [bar_colors[verdict] for verdict in verdicts]
+
+        # Bootstrap confidence interval of the change of each test
+        low = stats["Low"].reindex(avg_percentage.index).to_numpy(dtype=float)
+        high = stats["High"].reindex(avg_percentage.index).to_numpy(dtype=float)
+        percentages = avg_percentage["Percentage"].to_numpy()
 
         # Prevent annotations from going outside the plot
-        min_percentage = avg_percentage.min().min()
-        max_percentage = avg_percentage.max().max()
+        min_percentage = np.nanmin(np.concatenate([percentages, low]))
+        max_percentage = np.nanmax(np.concatenate([percentages, high]))
 
-        ax.set_xlim(min(-2, min_percentage * 2), max(2, max_percentage * 2))
+        ax.set_xlim(min(-2, min_percentage * 2.5), max(2, max_percentage * 2.5))
 
         avg_percentage["Percentage"].plot(kind="barh", ax=ax, color=colors, width=0.8)
-        for container in ax.containers:
+        ax.errorbar(
+            percentages,
+            np.arange(len(percentages)),
+            xerr=[
+                np.maximum(percentages - low, 0),
+                np.maximum(high - percentages, 0),
+            ],
+            fmt="none",
+            ecolor=BLACK,
+            capsize=3,
+            linewidth=1,
+        )
+
+        for container in ax.containers[:1]:
             for i, bar in enumerate(container.patches):
                 percentage = avg_percentage.iloc[i]["Percentage"]
                 change_text = f"{percentage:.2f}"
-                rounded_percentage = round(percentage, 2)
                 x_min, x_max = ax.get_xlim()
                 bar.set_edgecolor("black")
                 bar.set_linewidth(1)
 
-                # Get the test name for this bar
-                test_name = avg_percentage.index[i]
-
-                # Get RSD values for this test
-                base_rsd = rsd_data.get((test_name, "base"), 0)
-                byte_rsd = rsd_data.get((test_name, "byte"), 0)
-
-                # Calculate the sum of RSD values instead of taking the maximum
-                total_rsd = base_rsd + byte_rsd
-
-                # Add the sum of RSD percentages to the annotation
-                rsd_text = f" ± {total_rsd:.2f}%"
+                # Add the confidence interval to the annotation
+                ci_text = f" [{low[i]:+.2f}, {high[i]:+.2f}]"
 
                 # Calculate text position for consistent alignment
-                # For positive percentages, place text to the right of the bar
-                # For negative percentages, place text to the left of the bar
+                # For positive percentages, place text to the right of the interval
+                # For negative percentages, place text to the left of the interval
                 if percentage > 0:
-                    # For positive values, position text after the bar
-                    text_x = percentage + 0.02 * (x_max - x_min)
+                    # For positive values, position text after the interval
+                    text_x = max(percentage, np.nan_to_num(high[i])) + 0.02 * (x_max - x_min)
                     text_ha = "left"  # Left-align text
                 else:
-                    # For negative values, position text before the bar
-                    text_x = percentage - 0.02 * (x_max - x_min)
+                    # For negative values, position text before the interval
+                    text_x = min(percentage, np.nan_to_num(low[i])) - 0.02 * (x_max - x_min)
                     text_ha = "right"  # Right-align text
 
                 ax.text(
                     text_x,
                     i - 0.1,
-                    change_text + rsd_text,
+                    change_text + ci_text,
                     ha=text_ha,  # Use the calculated alignment
-                    color=(
-                        BRIGHTRED
-                        if rounded_percentage > 0
-                        else BRIGHTGREEN if rounded_percentage < 0 else BRIGHTYELLOW
-                    ),
+                    color=VERDICT_COLORS[verdicts.iloc[i]],
                     fontsize=10,
                     fontweight="bold",
                 )
@@ -240,6 +613,7 @@ class RuntimeResultsExtractor(ResultsExtractor):
         plt.xlabel(
             "Runtime regression relative to baseline (%)", fontsize=12, color="#24292F"
         )
+        verdict_legend(ax, bar_colors)
 
         ax.grid(
             True,
@@ -262,55 +636,99 @@ class RuntimeResultsExtractor(ResultsExtractor):
         plt.close()
 
 
+def paired_samples(samples):
+    # Lower is better pairs of the base and byte samples of each test
+    return {
+        test: [(samples[(test, "base")], samples[(test, "byte")], False)]
+        for test, profile in sorted(samples)
+        if profile == "base" and (test, "byte") in samples
+    }
+
+
+def read_compile_records(path):
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
 class CompileTimeResultsExtractor(ResultsExtractor):
+    metric = "compile-time"
+    columns = ["Test", "Profile", "Compile Time"]
+
     def compute_results(self):
         self.results = []
-
-        for test in os.listdir(self.results_dir + "/compile-time"):
-            for profile in os.listdir(self.results_dir + "/compile-time/" + test):
-                flag_dir = os.path.join(
-                    self.results_dir, "compile-time", test, profile, FLAG
-                )
-                times = [
-                    int(line.split("\t")[1])
-                    for f in os.listdir(flag_dir)
-                    for line in open(os.path.join(flag_dir, f)).read().splitlines()
-                ]
-                self.results += [
-                    (test, profile, sum(times) / len(os.listdir(flag_dir)))
-                ]
+        # Compile time of each round of each (test, profile), for statistics
+        self.samples = {}
+        for results, samples in self.map_tests("compile-records", self.compute_test):
+            self.results += results
+            for result, sample in zip(results, samples):
+                self.samples[(result[0], result[1])] = sample
 
         self.results.sort(key=lambda x: (x[0], x[1]))
 
-    def write_results(self, results_file):
+    @staticmethod
+    def compute_test(results_dir, test):
+        results = []
+        samples = []
+        for profile in os.listdir(results_dir + "/compile-records/" + test):
+            records_path = os.path.join(
+                results_dir, "compile-records", test, profile, f"{FLAG}.jsonl"
+            )
+
+            times = cached(CompileTimeResultsExtractor.parse_file, records_path)
+            results += [(test, profile, sum(times.values()) / len(times))]
+            samples.append(
+                np.array([times[round] for round in sorted(times)], dtype=np.float64)
+            )
+
+        return results, samples
+
+    @staticmethod
+    def parse_file(records_path):
+        # Total compile time of each install round
+        times = {}
+        for record in read_compile_records(records_path):
+            times[record["round"]] = times.get(record["round"], 0) + record["wall_ms"]
+        return times
+
+    def pairs(self):
+        # Compile time of the rounds of each test
+        return paired_samples(self.samples)
+
+    def write_results(self, results_file, stats_file):
         print(f"Writing compile time results to {results_file}")
-        with open(results_file, "w") as f:
-            f.write("Test;Profile;Compile Time\n")
-            for test, profile, total in self.results:
-                f.write(f"{test};{profile};{total}\n")
+        super().write_results(results_file)
+        self.write_stats(stats_file)
+
+    def plot_inputs(self):
+        return self.load_results(), self.load_stats()
 
     def merge_results(self, results_file):
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         pivot_table = df.pivot_table(
             index=["Test"],
             columns="Profile",
             values="Compile Time",
+            observed=True,
         )
         pivot_table.to_csv(results_file, sep=";")
 
     def plot_results(self, results_file, plot_dir):
+        plt = pyplot()
         plot_file = f"{plot_dir}/compile-time.svg"
         print(f"Plotting compile time results to {plot_file}")
 
         # Read data and convert compile time to seconds
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         df["Compile Time"] = df["Compile Time"] / 1000
+        stats = self.load_stats()
 
         num_tests = len(df["Test"].unique())
         height = max(6, 0.5 * num_tests)
         _, ax = plt.subplots(figsize=(8, height))
         ax.set_facecolor(BACKGROUND)
-        df = df.pivot_table(index="Test", columns="Profile", values="Compile Time")
+        df = df.pivot_table(
+            index="Test", columns="Profile", values="Compile Time", observed=True
+        )
         df = df[["byte", "base"]]
         df.sort_values(by="Test", ascending=False, inplace=True)
         df.plot(kind="barh", ax=ax, color=[BLUE, RED], width=0.7)
@@ -329,7 +747,7 @@ class CompileTimeResultsExtractor(ResultsExtractor):
 
         # Prevent annotations from going outside the plot
         max_value = df.max().max()
-        ax.set_xlim(1, max_value * 1.12)
+        ax.set_xlim(1, max_value * 1.4)
 
         # Tilt x-axis labels for better readability
         plt.yticks(rotation=45, ha="right", fontsize=11, color=BLACK)
@@ -356,21 +774,24 @@ class CompileTimeResultsExtractor(ResultsExtractor):
             else:
                 change_text = "nan%"
 
+            # Color the change by the verdict of the test, and add its
+            # confidence interval
+            verdict = "inconclusive"
+            if test in stats.index:
+                verdict = stats.loc[test, "Verdict"]
+                low, high = stats.loc[test, "Low"], stats.loc[test, "High"]
+                change_text += f" [{low:+.2f}, {high:+.2f}]"
+
             x_min, x_max = ax.get_xlim()
-            rounded_percentage_change = round(percentage_change, 2)
             ax.text(
                 max(
-                    0.05 * (x_max - x_min),
-                    max(base_value, byte_value) + 0.05 * (x_max - x_min),
+                    0.02 * (x_max - x_min),
+                    max(base_value, byte_value) + 0.02 * (x_max - x_min),
                 ),
                 i - 0.1,
                 change_text,
-                ha="center",
-                color=(
-                    BRIGHTRED
-                    if rounded_percentage_change > 0
-                    else BRIGHTGREEN if rounded_percentage_change < 0 else BRIGHTYELLOW
-                ),
+                ha="left",
+                color=VERDICT_COLORS[verdict],
                 fontsize=10,
                 fontweight="bold",
             )
@@ -388,53 +809,313 @@ class CompileTimeResultsExtractor(ResultsExtractor):
         plt.close()
 
 
-class ObjectSizeResultsExtractor(ResultsExtractor):
+def output_file(argv):
+    for i, arg in enumerate(argv):
+        if arg == "-o" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("-o") and len(arg) > 2:
+            return arg[2:]
+    return ""
+
+
+def normalize_command(records):
+    # Match compiles across configs by working directory, input and output,
+    # with the per-config install root. The rest of the command line carries
+    # the flags of each config (and the inline replay file of the prototype)
+    commands = pd.Series(
+        [
+            record["cwd"]
+            + "$ "
+            + (record["input"] or "")
+            + " -o "
+            + output_file(record["argv"])
+            for record in records
+        ],
+        dtype="string",
+    )
+    return commands.str.replace(r"/installed-tests/[^/]+/", "/installed-tests/*/", regex=True)
+
+
+class CompileTimeTUResultsExtractor(ResultsExtractor):
+    metric = "compile-time-tu"
+    columns = ["Test", "Input", "Command", "base", "byte", "Delta", "Percentage"]
+
+    def __init__(self, results_dir, executor=None, top_n=10):
+        self.top_n = top_n
+        super().__init__(results_dir, executor)
+
+    def compute_results(self):
+        self.results = [
+            tus
+            for tus in self.map_tests("compile-records", self.compute_test)
+            if tus is not None
+        ]
+
+    @staticmethod
+    def compute_test(results_dir, test):
+        medians = {}
+        for profile in os.listdir(results_dir + "/compile-records/" + test):
+            records_path = os.path.join(
+                results_dir, "compile-records", test, profile, f"{FLAG}.jsonl"
+            )
+            medians[profile] = cached(
+                CompileTimeTUResultsExtractor.parse_file, records_path
+            )
+
+        if "base" not in medians or "byte" not in medians:
+            return None
+
+        tus = pd.concat(
+            [medians["base"], medians["byte"]],
+            axis=1,
+            keys=["base", "byte"],
+            join="inner",
+        )
+        tus["Delta"] = tus["byte"] - tus["base"]
+        tus["Percentage"] = tus["Delta"] / tus["base"] * 100
+        tus = tus.sort_values(by="Delta", ascending=False).reset_index()
+        tus.insert(0, "Test", test)
+        return tus
+
+    @staticmethod
+    def parse_file(records_path):
+        records = read_compile_records(records_path)
+        df = pd.DataFrame(
+            {
+                "Round": [record["round"] for record in records],
+                "Input": [record["input"] or "" for record in records],
+                "Wall": [record["wall_ms"] for record in records],
+            }
+        )
+        df["Input"] = df["Input"].str.replace(
+            r"/installed-tests/[^/]+/", "/installed-tests/*/", regex=True
+        )
+        df["Command"] = normalize_command(records)
+
+        # The same command may run several times in a round
+        df["Occurrence"] = df.groupby(["Round", "Command"]).cumcount()
+
+        # Median compile time of each translation unit across rounds
+        return df.groupby(["Command", "Occurrence", "Input"])["Wall"].median()
+
+    def to_frame(self):
+        if not self.results:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(self.results, ignore_index=True)[self.columns]
+
+    def write_results(self, results_file, top_results_file):
+        print(f"Writing per translation unit compile time results to {results_file}")
+        print(f"Writing top regressing translation units to {top_results_file}")
+        super().write_results(results_file)
+
+        # Each test's translation units are sorted by decreasing delta
+        df = self.to_frame()
+        results_store.export_csv(
+            df.groupby("Test", sort=False).head(self.top_n), top_results_file
+        )
+
+    def merge_results(self, results_file):
+        # Not applicable for this analysis
+        pass
+
+
+class TimeTraceResultsExtractor(ResultsExtractor):
+    metric = "time-trace"
+    columns = ["Test", "Profile", "Pass", "Duration"]
+
     def compute_results(self):
         self.results = []
+        for results in self.map_tests("time-trace", self.compute_test):
+            self.results += results
+
+        self.results.sort(key=lambda x: (x[0], x[1], -x[3], x[2]))
 
-        for test in os.listdir(self.results_dir + "/object-size"):
-            for profile in os.listdir(self.results_dir + "/object-size/" + test):
-                profile_path = os.path.join(
-                    self.results_dir + "/object-size", test, profile, f"{FLAG}.txt"
+    @staticmethod
+    def compute_test(results_dir, test):
+        results = []
+        for profile in os.listdir(results_dir + "/time-trace/" + test):
+            profile_path = os.path.join(
+                results_dir + "/time-trace", test, profile, f"{FLAG}.txt"
+            )
+            results += [
+                (test, profile, name, duration)
+                for name, duration in cached(
+                    TimeTraceResultsExtractor.parse_file, profile_path
                 )
-                with open(profile_path, "r") as f:
-                    sum = 0
-                    for line in f:
-                        size, _ = line.split("\t")
-                        sum += int(size)
-                    self.results += [(test, profile, sum)]
+            ]
+
+        return results
+
+    @staticmethod
+    def parse_file(profile_path):
+        durations = []
+        with open(profile_path, "r") as f:
+            for line in f:
+                duration, name = line.rstrip("\n").split("\t", 1)
+                # Convert durations from us to ms
+                durations += [(name, int(duration) / 1000)]
+        return durations
+
+    def write_results(self, results_file):
+        print(f"Writing time trace results to {results_file}")
+        super().write_results(results_file)
+
+    def merge_results(self, results_file):
+        df = self.load_results()
+        pivot_table = df.pivot_table(
+            index=["Test", "Pass"],
+            columns="Profile",
+            values="Duration",
+            observed=True,
+        )
+        pivot_table.to_csv(results_file, sep=";")
+
+    def plot_results(self, results_file, plot_dir, num_passes=30):
+        plt = pyplot()
+        plot_file = f"{plot_dir}/time-trace.svg"
+        print(f"Plotting time trace results to {plot_file}")
+
+        # Read data and convert durations to seconds
+        df = self.load_results()
+        df["Duration"] = df["Duration"] / 1000
+
+        # Rank the passes/phases of all tests by their regression
+        df = df.pivot_table(
+            index=["Test", "Pass"], columns="Profile", values="Duration", observed=True
+        ).fillna(0)
+        df = df.drop(index="ExecuteCompiler", level="Pass", errors="ignore")
+        df["Delta"] = df["byte"] - df["base"]
+        df = df.reindex(df["Delta"].abs().sort_values(ascending=False).index)
+        df = df.head(num_passes).sort_values(by="Delta")
+        labels = [f"{test}: {name}" for test, name in df.index]
+
+        height = max(6, 0.4 * len(df))
+        _, ax = plt.subplots(figsize=(10, height))
+        ax.set_facecolor(BACKGROUND)
+        ax.barh(
+            labels,
+            df["Delta"],
+            color=[RED if delta > 0 else GREEN for delta in df["Delta"]],
+            edgecolor="black",
+            linewidth=1,
+            height=0.8,
+        )
+
+        # Prevent annotations from going outside the plot
+        max_delta = df["Delta"].abs().max()
+        ax.set_xlim(-max_delta * 1.5, max_delta * 1.5)
+
+        # Annotate plots with regression percentage
+        x_min, x_max = ax.get_xlim()
+        for i, (base_value, delta) in enumerate(zip(df["base"], df["Delta"])):
+            if base_value > 0:
+                percentage_change = delta / base_value * 100
+                change_text = f"{percentage_change:+.2f}%"
+            else:
+                change_text = "new"
+
+            ax.text(
+                delta + (0.02 if delta >= 0 else -0.02) * (x_max - x_min),
+                i - 0.1,
+                change_text,
+                ha="left" if delta >= 0 else "right",
+                color=BRIGHTRED if delta > 0 else BRIGHTGREEN,
+                fontsize=10,
+                fontweight="bold",
+            )
+
+        ax.set(ylabel=None)
+        plt.xlabel(
+            "Compile time change per pass/phase relative to baseline (sec)",
+            fontsize=12,
+            color=BLACK,
+        )
+
+        ax.grid(
+            True,
+            which="both",
+            axis="x",
+            linestyle="dotted",
+            color="#8B949E",
+            alpha=0.7,
+        )
+
+        ax.axvline(x=0, color="black", linestyle="dotted", linewidth=1)
+        plt.yticks(fontsize=9, color=BLACK)
+
+        plt.tight_layout()
+        plt.savefig(plot_file)
+        plt.close()
+
+
+class ObjectSizeResultsExtractor(ResultsExtractor):
+    metric = "object-size"
+    columns = ["Test", "Profile", "Size"]
+
+    def compute_results(self):
+        self.results = []
+        for results in self.map_tests("object-size", self.compute_test):
+            self.results += results
 
         self.results.sort(key=lambda x: (x[0], x[1]))
 
+    @staticmethod
+    def compute_test(results_dir, test):
+        results = []
+        for profile in os.listdir(results_dir + "/object-size/" + test):
+            profile_path = os.path.join(
+                results_dir + "/object-size", test, profile, f"{FLAG}.txt"
+            )
+            sum = cached(ObjectSizeResultsExtractor.parse_file, profile_path)
+            results += [(test, profile, sum)]
+
+        return results
+
+    @staticmethod
+    def parse_file(profile_path):
+        with open(profile_path, "r") as f:
+            sum = 0
+            for line in f:
+                size, _ = line.split("\t")
+                sum += int(size)
+        return sum
+
+    def pairs(self):
+        # Object sizes are deterministic, so each one is a single sample
+        return paired_samples(
+            {(test, profile): np.array([size]) for test, profile, size in self.results}
+        )
+
     def write_results(self, results_file):
         print(f"Writing object size results to {results_file}")
-        with open(results_file, "w") as f:
-            f.write("Test;Profile;Size\n")
-            for test, profile, size in self.results:
-                f.write(f"{test};{profile};{size}\n")
+        super().write_results(results_file)
 
     def merge_results(self, results_file):
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         pivot_table = df.pivot_table(
             index=["Test"],
             columns="Profile",
             values="Size",
+            observed=True,
         )
         pivot_table.to_csv(results_file, sep=";")
 
     def plot_results(self, results_file, plot_dir):
+        plt = pyplot()
         plot_file = f"{plot_dir}/object-size.svg"
         print(f"Plotting object size results to {plot_file}")
 
         # Read data and convert object size to MB
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         df["Size"] = df["Size"] / (1024 * 1024)
 
         num_tests = len(df["Test"].unique())
         height = max(6, 0.5 * num_tests)
         _, ax = plt.subplots(figsize=(8, height))
         ax.set_facecolor(BACKGROUND)
-        df = df.pivot_table(index="Test", columns="Profile", values="Size")
+        df = df.pivot_table(
+            index="Test", columns="Profile", values="Size", observed=True
+        )
         df = df[["byte", "base"]]
         df.sort_values(by="Test", ascending=False, inplace=True)
         df.plot(kind="barh", ax=ax, color=[BLUE, RED], width=0.7)
@@ -512,54 +1193,250 @@ class ObjectSizeResultsExtractor(ResultsExtractor):
         plt.close()
 
 
+def section_group(section):
+    if section == ".text" or section.startswith(".text."):
+        return ".text"
+    if section.startswith(".rodata"):
+        return ".rodata"
+    if section.startswith((".data", ".tdata", ".got", ".init_array", ".fini_array")):
+        return ".data"
+    if section in (".eh_frame", ".eh_frame_hdr", ".gcc_except_table"):
+        return ".eh_frame"
+    if section.startswith((".debug", ".zdebug")):
+        return "debug"
+    if section in (".symtab", ".strtab", ".dynsym", ".dynstr", ".shstrtab"):
+        return "symbols"
+    return "other"
+
+
+SECTION_GROUPS = [".text", ".rodata", ".data", ".eh_frame", "debug", "symbols", "other"]
+SECTION_COLORS = [BLUE, PURPLE, CYAN, YELLOW, WHITE, GREEN, BRIGHTBLACK]
+
+
+class SectionSizeResultsExtractor(ResultsExtractor):
+    metric = "section-size"
+    columns = ["Test", "Profile", "Section", "Size"]
+
+    def compute_results(self):
+        self.results = []
+        for results in self.map_tests("section-size", self.compute_test):
+            self.results += results
+
+        self.results.sort(key=lambda x: (x[0], x[1], -x[3], x[2]))
+
+    @staticmethod
+    def compute_test(results_dir, test):
+        results = []
+        for profile in os.listdir(results_dir + "/section-size/" + test):
+            profile_path = os.path.join(
+                results_dir + "/section-size", test, profile, f"{FLAG}.txt"
+            )
+            results += [
+                (test, profile, section, size)
+                for section, size in cached(
+                    SectionSizeResultsExtractor.parse_file, profile_path
+                )
+            ]
+
+        return results
+
+    @staticmethod
+    def parse_file(profile_path):
+        sizes = []
+        with open(profile_path, "r") as f:
+            for line in f:
+                size, section = line.rstrip("\n").split("\t")
+                sizes += [(section, int(size))]
+        return sizes
+
+    def write_results(self, results_file):
+        print(f"Writing section size results to {results_file}")
+        super().write_results(results_file)
+
+    def merge_results(self, results_file):
+        df = self.load_results()
+        pivot_table = df.pivot_table(
+            index=["Test", "Section"],
+            columns="Profile",
+            values="Size",
+            observed=True,
+        )
+        pivot_table.to_csv(results_file, sep=";")
+
+    def plot_results(self, results_file, plot_dir):
+        plt = pyplot()
+        plot_file = f"{plot_dir}/section-size.svg"
+        print(f"Plotting section size results to {plot_file}")
+
+        # Sum section sizes per group of sections
+        df = self.load_results()
+        df["Group"] = df["Section"].map(section_group)
+        df = df.pivot_table(
+            index=["Test", "Group"],
+            columns="Profile",
+            values="Size",
+            aggfunc="sum",
+            observed=True,
+        ).fillna(0)
+
+        # Size delta of each group, relative to the total baseline size
+        base_total = df["base"].groupby("Test", observed=True).sum()
+        delta = (df["byte"] - df["base"]).unstack("Group").fillna(0)
+        delta = delta.reindex(columns=SECTION_GROUPS, fill_value=0)
+        delta = delta.div(base_total, axis=0) * 100
+        delta.sort_index(ascending=False, inplace=True)
+
+        num_tests = len(delta.index)
+        height = max(6, 0.5 * num_tests)
+        _, ax = plt.subplots(figsize=(8, height))
+        ax.set_facecolor(BACKGROUND)
+
+        # Stack growing sections to the right and shrinking ones to the left
+        positive = np.zeros(num_tests)
+        negative = np.zeros(num_tests)
+        for group, color in zip(SECTION_GROUPS, SECTION_COLORS):
+            values = delta[group].to_numpy()
+            left = np.where(values >= 0, positive, negative)
+            ax.barh(
+                delta.index,
+                values,
+                left=left,
+                color=color,
+                edgecolor="black",
+                linewidth=1,
+                height=0.7,
+                label=group,
+            )
+            positive += np.where(values >= 0, values, 0)
+            negative += np.where(values < 0, values, 0)
+
+        # Annotate plots with the net regression percentage
+        x_min = min(-2, negative.min() * 1.3)
+        x_max = max(2, positive.max() * 1.3)
+        ax.set_xlim(x_min, x_max)
+        for i, percentage in enumerate(delta.sum(axis=1)):
+            rounded_percentage = round(percentage, 2)
+            ax.text(
+                positive[i] + 0.02 * (x_max - x_min),
+                i - 0.1,
+                f"{percentage:.2f}%",
+                ha="left",
+                color=(
+                    BRIGHTRED
+                    if rounded_percentage > 0
+                    else BRIGHTGREEN if rounded_percentage < 0 else BRIGHTYELLOW
+                ),
+                fontsize=10,
+                fontweight="bold",
+            )
+
+        ax.set(ylabel=None)
+        plt.xlabel(
+            "Object size change relative to baseline (%)", fontsize=12, color=BLACK
+        )
+
+        ax.grid(
+            True,
+            which="both",
+            axis="x",
+            linestyle="dotted",
+            color="#8B949E",
+            alpha=0.7,
+        )
+
+        ax.axvline(x=0, color="black", linestyle="dotted", linewidth=1)
+        plt.yticks(rotation=45, ha="right", fontsize=11, color=BLACK)
+
+        ax.legend(
+            loc="upper right",
+            fontsize=10,
+            frameon=True,
+            framealpha=1,
+        )
+
+        plt.subplots_adjust(bottom=0.1, top=0.99, left=0.15, right=0.98)
+        plt.savefig(plot_file)
+        plt.close()
+
+
 class MemoryUsageResultsExtractor(ResultsExtractor):
+    metric = "memory-usage"
+    columns = ["Test", "Profile", "Peak Memory Usage"]
+
     def compute_results(self):
         self.results = []
-        for test in os.listdir(self.results_dir + "/memory-usage"):
-            for profile in os.listdir(self.results_dir + "/memory-usage/" + test):
-                flag_dir = os.path.join(
-                    self.results_dir, "memory-usage", test, profile, FLAG
+        # Peak memory usage of each round of each (test, profile)
+        self.samples = {}
+        for results, samples in self.map_tests("compile-records", self.compute_test):
+            self.results += results
+            for result, sample in zip(results, samples):
+                self.samples[(result[0], result[1])] = sample
+
+    @staticmethod
+    def compute_test(results_dir, test):
+        results = []
+        samples = []
+        for profile in os.listdir(results_dir + "/compile-records/" + test):
+            records_path = os.path.join(
+                results_dir, "compile-records", test, profile, f"{FLAG}.jsonl"
+            )
+
+            mem_usage = cached(MemoryUsageResultsExtractor.parse_file, records_path)
+            results += [(test, profile, sum(mem_usage.values()) / len(mem_usage))]
+            samples.append(
+                np.array(
+                    [mem_usage[round] for round in sorted(mem_usage)], dtype=np.float64
                 )
-                mem_usage = []
-                for f in os.listdir(flag_dir):
-                    with open(os.path.join(flag_dir, f), "r") as f:
-                        for line in f:
-                            if re.match(r"^\d+$", line.strip()):
-                                mem_usage += [int(line.strip())]
+            )
+
+        return results, samples
 
-                self.results += [
-                    (test, profile, max(mem_usage) / len(os.listdir(flag_dir)))
-                ]
+    def pairs(self):
+        return paired_samples(self.samples)
+
+    @staticmethod
+    def parse_file(records_path):
+        # Peak memory usage of each install round
+        mem_usage = {}
+        for record in read_compile_records(records_path):
+            mem_usage[record["round"]] = max(
+                mem_usage.get(record["round"], 0), record["maxrss_kb"]
+            )
+        return mem_usage
 
     def write_results(self, results_file):
         print(f"Writing memory usage results to {results_file}")
-        with open(results_file, "w") as f:
-            f.write("Test;Profile;Peak Memory Usage\n")
-            for test, profile, maximum in self.results:
-                f.write(f"{test};{profile};{maximum}\n")
+        super().write_results(results_file)
 
     def merge_results(self, results_file):
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         pivot_table = df.pivot_table(
             index=["Test"],
             columns="Profile",
             values="Peak Memory Usage",
+            observed=True,
         )
         pivot_table.to_csv(results_file, sep=";")
 
     def plot_results(self, results_file, plot_dir):
+        plt = pyplot()
         plot_file = f"{plot_dir}/memory-usage.svg"
         print(f"Plotting memory usage results to {plot_file}")
 
         # Read data and convert memory usage to MB
-        df = pd.read_csv(results_file, sep=";")
+        df = self.load_results()
         df["Peak Memory Usage"] = df["Peak Memory Usage"] / 1024
 
         num_tests = len(df["Test"].unique())
         height = max(6, 0.5 * num_tests)
         _, ax = plt.subplots(figsize=(8, height))
         ax.set_facecolor(BACKGROUND)
-        df = df.pivot_table(index="Test", columns="Profile", values="Peak Memory Usage")
+        df = df.pivot_table(
+            index="Test",
+            columns="Profile",
+            values="Peak Memory Usage",
+            observed=True,
+        )
         df = df[["byte", "base"]]
         df.sort_values(by="Test", ascending=False, inplace=True)
         df.plot(kind="barh", ax=ax, color=[BLUE, RED], width=0.7)
@@ -638,50 +1515,56 @@ class MemoryUsageResultsExtractor(ResultsExtractor):
 
 
 class TestInfoExtractor(ResultsExtractor):
-    def __init__(self, results_dir, test_profiles_dir):
-        super().__init__(results_dir)
+    metric = "test-info"
+    columns = ["Test", "Version", "Description", "LOC"]
+
+    def __init__(self, results_dir, executor=None, test_profiles_dir=None):
         self.test_profiles_dir = test_profiles_dir
+        super().__init__(results_dir, executor)
 
     def compute_results(self):
-        self.results = []
+        self.results = self.map_tests(
+            "object-size", self.compute_test, test_profiles_dir=self.test_profiles_dir
+        )
 
-        for test in os.listdir(self.results_dir + "/object-size"):
-            profile = os.listdir(self.results_dir + "/object-size/" + test)[0]
-            profile_path = os.path.join(
-                self.results_dir + "/object-size", test, profile, f"{FLAG}.txt"
-            )
-            loc = 0
-            with open(profile_path, "r") as f:
-                for line in f:
-                    # File output has a tab
-                    if (len(line.split("\t"))) != 3:
-                        continue
-                    size, _, type = line.split("\t")
-                    if "C source" in type or "C++ source" in type:
-                        loc += int(size)
-
-            with open(
-                os.path.join(
-                    args.test_profiles_dir, "local", test, "test-definition.xml"
-                ),
-                "r",
-            ) as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
+        self.results.sort(key=lambda x: x[0])
+
+    @staticmethod
+    def compute_test(results_dir, test, test_profiles_dir):
+        profile = os.listdir(results_dir + "/object-size/" + test)[0]
+        profile_path = os.path.join(
+            results_dir + "/object-size", test, profile, f"{FLAG}.txt"
+        )
+        loc = cached(TestInfoExtractor.parse_file, profile_path)
 
-                version = root.find(".//AppVersion").text
-                description = root.find(".//Description").text
+        with open(
+            os.path.join(test_profiles_dir, "local", test, "test-definition.xml"),
+            "r",
+        ) as f:
+            tree = ET.parse(f)
+            root = tree.getroot()
 
-            self.results += [(test, version, description, loc)]
+            version = root.find(".//AppVersion").text
+            description = root.find(".//Description").text
 
-        self.results.sort(key=lambda x: x[0])
+        return (test, version, description, loc)
+
+    @staticmethod
+    def parse_file(profile_path):
+        loc = 0
+        with open(profile_path, "r") as f:
+            for line in f:
+                # File output has a tab
+                if (len(line.split("\t"))) != 3:
+                    continue
+                size, _, type = line.split("\t")
+                if "C source" in type or "C++ source" in type:
+                    loc += int(size)
+        return loc
 
     def write_results(self, results_file):
         print(f"Writing line of code results to {results_file}")
-        with open(results_file, "w") as f:
-            f.write("Test;Version;Description;LOC\n")
-            for test_name, version, description, loc in self.results:
-                f.write(f"{test_name};{version};{description};{loc}\n")
+        super().write_results(results_file)
 
     def merge_results(self, results_file):
         raise NotImplementedError
@@ -691,64 +1574,124 @@ class TestInfoExtractor(ResultsExtractor):
 
 
 class AsmSizeResultsExtractor(ResultsExtractor):
+    metric = "asm-size"
+    columns = ["Test", "Profile", "Function", "Size"]
+
     def compute_results(self):
-        self.results = []
+        # Function names are interned per test: symbols[test] holds the sorted
+        # names, and function_sizes[test][profile] the symbol IDs and sizes of
+        # each function of a profile (in file order)
+        self.symbols = {}
         self.function_sizes = {}
         self.all_functions = {}
         self.diff_functions = {}
         self.diff_loose_functions = {}  # Add new dictionary for loose diff
 
-        for test in os.listdir(self.results_dir + "/asm-diff"):
-            self.function_sizes[test] = {}
+        for test, symbols, function_sizes, counts in self.map_tests(
+            "asm-diff", self.compute_test
+        ):
+            self.symbols[test] = symbols
+            self.function_sizes[test] = function_sizes
+            for functions, count in zip(
+                (self.all_functions, self.diff_functions, self.diff_loose_functions),
+                counts,
+            ):
+                if count is not None:
+                    functions[test] = count
 
-            for profile in os.listdir(self.results_dir + "/asm-diff/" + test):
-                self.function_sizes[test][profile] = {}
-                profile_path = os.path.join(
-                    self.results_dir + "/asm-diff", test, profile, FLAG, "sizes.txt"
-                )
+    @staticmethod
+    def compute_test(results_dir, test):
+        names = {}
+        sizes = {}
 
-                if not os.path.exists(profile_path):
-                    continue
+        for profile in sorted(os.listdir(results_dir + "/asm-diff/" + test)):
+            profile_path = os.path.join(
+                results_dir + "/asm-diff", test, profile, FLAG, "sizes.txt"
+            )
 
-                with open(profile_path, "r") as f:
-                    for line in f:
-                        size_str, func_name = line.strip().split()
-                        size = int(size_str)
-                        self.function_sizes[test][profile][func_name] = size
-                        self.results.append((test, profile, func_name, size))
+            if not os.path.exists(profile_path):
+                continue
 
-                all_functions_path = os.path.join(
-                    self.results_dir + "/asm-diff", test, FLAG, "all.txt"
-                )
-                if not os.path.exists(all_functions_path):
-                    continue
-                with open(all_functions_path, "r") as f:
-                    self.all_functions[test] = sum(1 for _ in f)
-                diff_functions_path = os.path.join(
-                    self.results_dir + "/asm-diff", test, FLAG, "diff.txt"
-                )
-                if not os.path.exists(diff_functions_path):
-                    continue
-                with open(diff_functions_path, "r") as f:
-                    self.diff_functions[test] = sum(1 for _ in f)
-                # Add reading of loose diff file
-                diff_loose_path = os.path.join(
-                    self.results_dir + "/asm-diff", test, FLAG, "diff_loose.txt"
-                )
-                if not os.path.exists(diff_loose_path):
-                    continue
-                with open(diff_loose_path, "r") as f:
-                    self.diff_loose_functions[test] = sum(1 for _ in f)
+            names[profile], sizes[profile] = cached(
+                AsmSizeResultsExtractor.parse_file, profile_path
+            )
 
-        self.results.sort(key=lambda x: (x[0], x[1], x[3], x[2]))
+        # Intern the names of all profiles at once, numbering them in sorted order
+        ids, symbols = pd.factorize(
+            np.concatenate(list(names.values()) or [np.empty(0, dtype=object)]),
+            sort=True,
+        )
+        ids = ids.astype(np.int32)
+        function_sizes = {}
+        offset = 0
+        for profile in names:
+            count = len(names[profile])
+            function_sizes[profile] = (ids[offset : offset + count], sizes[profile])
+            offset += count
+
+        # Number of compared, changed and loosely changed functions (a count is
+        # only read if the previous one exists)
+        counts = [None, None, None]
+        for i, name in enumerate(["all.txt", "diff.txt", "diff_loose.txt"]):
+            path = os.path.join(results_dir + "/asm-diff", test, FLAG, name)
+            if not os.path.exists(path):
+                break
+            counts[i] = cached(AsmSizeResultsExtractor.count_lines, path)
+
+        return test, np.asarray(symbols, dtype=object), function_sizes, counts
+
+    @staticmethod
+    def parse_file(profile_path):
+        names = []
+        sizes = []
+        with open(profile_path, "r") as f:
+            for line in f:
+                size_str, func_name = line.strip().split()
+                names.append(func_name)
+                sizes.append(int(size_str))
+        return np.array(names, dtype=object), np.array(sizes, dtype=np.int64)
+
+    @staticmethod
+    def count_lines(path):
+        with open(path, "r") as f:
+            return sum(1 for _ in f)
+
+    def unique_sizes(self, test, profile):
+        # Sorted symbol IDs and their sizes, keeping the last size of repeated
+        # functions
+        ids, sizes = self.function_sizes[test][profile]
+        unique_ids, last = np.unique(ids[::-1], return_index=True)
+        return unique_ids, sizes[::-1][last]
+
+    def frames(self):
+        # Results of each test and profile, sorted by size and function name
+        for test in sorted(self.function_sizes):
+            for profile in sorted(self.function_sizes[test]):
+                ids, sizes = self.function_sizes[test][profile]
+                order = np.lexsort((ids, sizes))
+                yield pd.DataFrame(
+                    {
+                        "Test": test,
+                        "Profile": profile,
+                        "Function": pd.Categorical.from_codes(
+                            ids[order], categories=self.symbols[test]
+                        ).remove_unused_categories(),
+                        "Size": sizes[order],
+                    }
+                )
 
     def write_results(self, results_file):
         print(f"Writing ASM function size results to {results_file}")
+
+        # Stream the results one test and profile at a time
         with open(results_file, "w") as f:
-            f.write("Test;Profile;Function;Size\n")
-            for test, profile, func_name, size in self.results:
-                func_name = func_name.replace(";", "\\;")
-                f.write(f"{test};{profile};{func_name};{size}\n")
+            f.write(";".join(self.columns) + "\n")
+            for df in self.frames():
+                if STORE:
+                    results_store.write_metric(
+                        self.results_dir, self.metric, df.assign(Flag=FLAG)
+                    )
+                results_store.export_csv(df, f, header=False)
 
     def merge_results(self, results_file):
         # Not applicable for this analysis
@@ -761,20 +1704,10 @@ class AsmSizeResultsExtractor(ResultsExtractor):
                 return f.read().strip() == 'y'
         return False
 
-    def plot_results(self, results_file, plot_dir):
-        plot_file_size = f"{plot_dir}/asm-size.svg"
-        plot_file_diff = f"{plot_dir}/asm-diff.svg"
-        print(f"Plotting ASM function size to {plot_file_size}")
-        print(f"Plotting ASM function size differences to {plot_file_diff}")
-
-        # First pass: collect data
+    def plot_data(self):
+        # Functions of each test present in both profiles, with their sizes
+        # in each profile and summary statistics
         test_data = {}
-        tests = []
-        global_min_size = float("inf")
-        global_max_size = float("-inf")
-        global_min_diff = float("inf")
-        global_max_diff = float("-inf")
-
         for test in self.function_sizes:
             if (
                 "base" not in self.function_sizes[test]
@@ -782,51 +1715,32 @@ class AsmSizeResultsExtractor(ResultsExtractor):
             ):
                 continue
 
-            base_sizes = self.function_sizes[test]["base"]
-            byte_sizes = self.function_sizes[test]["byte"]
-            common_funcs = set(base_sizes.keys()) & set(byte_sizes.keys())
+            # Join the functions of both profiles on their (sorted) symbol IDs
+            base_ids, base_sizes = self.unique_sizes(test, "base")
+            byte_ids, byte_sizes = self.unique_sizes(test, "byte")
+            common_ids, base_index, byte_index = np.intersect1d(
+                base_ids, byte_ids, assume_unique=True, return_indices=True
+            )
 
-            if not common_funcs:
+            if len(common_ids) == 0:
                 continue
 
             # Store sizes for both profiles
-            base_func_sizes = [base_sizes[func] for func in common_funcs]
-            byte_func_sizes = [byte_sizes[func] for func in common_funcs]
+            base_func_sizes = base_sizes[base_index]
+            byte_func_sizes = byte_sizes[byte_index]
 
             # Calculate size differences
-            size_diffs = [byte_sizes[func] - base_sizes[func] for func in common_funcs]
-
-            # Update global min/max for bin calculation
-            global_min_size = min(
-                global_min_size, min(base_func_sizes), min(byte_func_sizes)
-            )
-            global_max_size = max(
-                global_max_size, max(base_func_sizes), max(byte_func_sizes)
-            )
-            global_min_diff = min(global_min_diff, min(size_diffs))
-            global_max_diff = max(global_max_diff, max(size_diffs))
+            size_diffs = byte_func_sizes - base_func_sizes
 
             # Calculate total sizes
-            base_total = sum(base_func_sizes)
-            byte_total = sum(byte_func_sizes)
+            base_total = int(base_func_sizes.sum())
+            byte_total = int(byte_func_sizes.sum())
             total_diff = byte_total - base_total
 
             # Find min/max differences for summary
-            min_diff = min(size_diffs)
-            max_diff = max(size_diffs)
-
-            min_func = [
-                func
-                for func in common_funcs
-                if byte_sizes[func] - base_sizes[func] == min_diff
-            ][0]
-            max_func = [
-                func
-                for func in common_funcs
-                if byte_sizes[func] - base_sizes[func] == max_diff
-            ][0]
-
-            tests.append(test)
+            min_index = size_diffs.argmin()
+            max_index = size_diffs.argmax()
+
             test_data[test] = {
                 "base_sizes": base_func_sizes,
                 "byte_sizes": byte_func_sizes,
@@ -834,53 +1748,115 @@ class AsmSizeResultsExtractor(ResultsExtractor):
                 "base_total": base_total,
                 "byte_total": byte_total,
                 "total_diff": total_diff,
-                "min_diff": min_diff,
-                "max_diff": max_diff,
-                "min_func": min_func,
-                "max_func": max_func,
+                "min_diff": int(size_diffs[min_index]),
+                "max_diff": int(size_diffs[max_index]),
+                "min_func": self.symbols[test][common_ids[min_index]],
+                "max_func": self.symbols[test][common_ids[max_index]],
             }
 
         # Alphabetically sort the tests
-        tests.sort()
-
-        # Create figures for absolute sizes and differences
-        n_tests = len(tests)
-        fig_size, axes_size = plt.subplots(
-            n_tests, 1, figsize=(10, 3 * n_tests), sharex=False
-        )
-        fig_diff, axes_diff = plt.subplots(
-            n_tests, 1, figsize=(10, 3 * n_tests), sharex=False
+        return {test: test_data[test] for test in sorted(test_data)}
+
+    def summary(self, test, data):
+        summary = f"$\\mathbf{{Net:}}$  {data['total_diff']:+,d} bytes"
+        if test in self.diff_functions and test in self.all_functions:
+            summary += f" | $\\mathbf{{Changed\\ ASM:}}$  {self.diff_functions[test]} / {self.all_functions[test]} ({self.diff_functions[test] / self.all_functions[test] * 100:.2f}%)"
+            if test in self.diff_loose_functions:
+                summary += f" | {self.diff_loose_functions[test]} / {self.all_functions[test]} ({self.diff_loose_functions[test] / self.all_functions[test] * 100:.2f}%) functions"
+            if self.get_timeout_status(test):
+                summary += " (timeout)"
+
+        summary += f"\n$\\mathbf{{Min:}}$  {data['min_diff']:,d} @ {data['min_func'] if len(data['min_func']) <= 90 else data['min_func'][:90] + '...'}"
+        summary += f"\n$\\mathbf{{Max:}}$  {data['max_diff']:,d} @ {data['max_func'] if len(data['max_func']) <= 90 else data['max_func'][:90] + '...'}"
+        return summary
+
+    def plot_inputs(self):
+        # The plots are drawn from the parsed results, not from the store
+        return (
+            self.plot_data(),
+            [
+                (
+                    test,
+                    self.all_functions.get(test),
+                    self.diff_functions.get(test),
+                    self.diff_loose_functions.get(test),
+                    self.get_timeout_status(test),
+                )
+                for test in sorted(self.function_sizes)
+            ],
         )
+
+    def plots(self):
+        return {"asm-size.svg": self.plot_sizes, "asm-diff.svg": self.plot_diffs}
+
+    def plot_figure(self, plot_test):
+        # One subplot per test, with the summary of the test above it
+        plt = pyplot()
+        test_data = self.plot_data()
+        n_tests = len(test_data)
+        fig, axes = plt.subplots(n_tests, 1, figsize=(10, 3 * n_tests), sharex=False)
         if n_tests == 1:
-            axes_size = [axes_size]
-            axes_diff = [axes_diff]
+            axes = [axes]
 
-        # Create histograms for each test
-        for i, test in enumerate(tests):
-            ax_size = axes_size[i]
-            ax_diff = axes_diff[i]
-            ax_size.set_facecolor(BACKGROUND)
-            ax_diff.set_facecolor(BACKGROUND)
+        for ax, (test, data) in zip(axes, test_data.items()):
+            ax.set_facecolor(BACKGROUND)
+            plot_test(ax, data)
 
-            data = test_data[test]
+            # Add test name
+            ax.set_ylabel(test, fontsize=12, rotation=45, ha="right", va="center")
+
+            # Add legend
+            ax.legend(loc="upper right")
 
+            # Position text box above the upper left corner
+            ax.text(
+                0.02,
+                1.05,
+                self.summary(test, data),
+                transform=ax.transAxes,
+                ha="left",
+                va="bottom",
+                fontsize=9,
+                bbox=dict(boxstyle="round", facecolor="white", alpha=0.9, pad=0.6),
+                multialignment="left",
+                usetex=False,
+            )
+
+            # Grid
+            ax.grid(
+                True,
+                which="both",
+                axis="both",
+                linestyle="dotted",
+                color="#8B949E",
+                alpha=0.7,
+            )
+
+        return fig, axes
+
+    def plot_sizes(self, results_file, plot_dir):
+        plt = pyplot()
+        plot_file = f"{plot_dir}/asm-size.svg"
+        print(f"Plotting ASM function size to {plot_file}")
+
+        def plot_test(ax, data):
             # Calculate min and max size for this test
-            test_min_size = min(min(data["base_sizes"]), min(data["byte_sizes"]))
-            test_max_size = max(max(data["base_sizes"]), max(data["byte_sizes"]))
+            test_min_size = min(data["base_sizes"].min(), data["byte_sizes"].min())
+            test_max_size = max(data["base_sizes"].max(), data["byte_sizes"].max())
             test_log_min = np.log10(max(1, test_min_size))
             test_log_max = np.log10(test_max_size)
             # Use 70 bins for better visibility
             test_size_bins = np.logspace(test_log_min, test_log_max, 70)
 
             # Plot overlapping histograms with transparency for absolute sizes
-            ax_size.hist(
+            ax.hist(
                 data["base_sizes"],
                 bins=test_size_bins,
                 alpha=0.5,
                 color=RED,
                 label="Baseline",
             )
-            ax_size.hist(
+            ax.hist(
                 data["byte_sizes"],
                 bins=test_size_bins,
                 alpha=0.5,
@@ -889,18 +1865,28 @@ class AsmSizeResultsExtractor(ResultsExtractor):
             )
 
             # Set log scale on x-axis but linear scale on y-axis
-            ax_size.set_xscale("log")
-            ax_size.set_yscale("linear")
+            ax.set_xscale("log")
+            ax.set_yscale("linear")
+
+        fig, axes = self.plot_figure(plot_test)
+        axes[-1].set_xlabel("Function Size (bytes)", fontsize=12, color=BLACK)
+        plt.tight_layout()
+        plt.savefig(plot_file)
+        plt.close(fig)
 
+    def plot_diffs(self, results_file, plot_dir):
+        plt = pyplot()
+        plot_file = f"{plot_dir}/asm-diff.svg"
+        print(f"Plotting ASM function size differences to {plot_file}")
+
+        def plot_test(ax, data):
             # Calculate max difference for this specific test
-            test_max_abs_diff = max(
-                abs(min(data["size_diffs"])), abs(max(data["size_diffs"]))
-            )
+            test_max_abs_diff = max(abs(data["min_diff"]), abs(data["max_diff"]))
             # Create bins specific to this test's range
             test_diff_bins = np.linspace(-test_max_abs_diff, test_max_abs_diff, 151)
 
             # Plot histogram of size differences
-            ax_diff.hist(
+            ax.hist(
                 data["size_diffs"],
                 bins=test_diff_bins,
                 color=BLUE,
@@ -908,94 +1894,87 @@ class AsmSizeResultsExtractor(ResultsExtractor):
             )
 
             # Set log scale for difference plot
-            ax_diff.set_yscale("log")
+            ax.set_yscale("log")
 
-            # Set x-axis limits for difference plot to be symmetric and specific to this test
-            ax_diff.set_xlim(-test_max_abs_diff * 1.1, test_max_abs_diff * 1.1)
+            # Set x-axis limits to be symmetric and specific to this test
+            ax.set_xlim(-test_max_abs_diff * 1.1, test_max_abs_diff * 1.1)
 
-            # Add test name
-            ax_size.set_ylabel(test, fontsize=12, rotation=45, ha="right", va="center")
-            ax_diff.set_ylabel(test, fontsize=12, rotation=45, ha="right", va="center")
-
-            # Add legends
-            ax_size.legend(loc="upper right")
-            ax_diff.legend(loc="upper right")
-
-            # Add summary statistics
-            summary = f"$\\mathbf{{Net:}}$  {data['total_diff']:+,d} bytes"
-            if test in self.diff_functions and test in self.all_functions:
-                summary += f" | $\\mathbf{{Changed\\ ASM:}}$  {self.diff_functions[test]} / {self.all_functions[test]} ({self.diff_functions[test] / self.all_functions[test] * 100:.2f}%)"
-                if test in self.diff_loose_functions:
-                    summary += f" | {self.diff_loose_functions[test]} / {self.all_functions[test]} ({self.diff_loose_functions[test] / self.all_functions[test] * 100:.2f}%) functions"
-                if self.get_timeout_status(test):
-                    summary += " (timeout)"
-
-            summary += f"\n$\\mathbf{{Min:}}$  {data['min_diff']:,d} @ {data['min_func'] if len(data['min_func']) <= 90 else data['min_func'][:90] + '...'}"
-            summary += f"\n$\\mathbf{{Max:}}$  {data['max_diff']:,d} @ {data['max_func'] if len(data['max_func']) <= 90 else data['max_func'][:90] + '...'}"
-
-            # Position text box in lower left corner for both plots
-            ax_size.text(
-                0.02,
-                1.05,
-                summary,
-                transform=ax_size.transAxes,
-                ha="left",
-                va="bottom",
-                fontsize=9,
-                bbox=dict(boxstyle="round", facecolor="white", alpha=0.9, pad=0.6),
-                multialignment="left",
-                usetex=False,
-            )
-            ax_diff.text(
-                0.02,
-                1.05,
-                summary,
-                transform=ax_diff.transAxes,
-                ha="left",
-                va="bottom",
-                fontsize=9,
-                bbox=dict(boxstyle="round", facecolor="white", alpha=0.9, pad=0.6),
-                multialignment="left",
-                usetex=False,
-            )
+            # Add vertical line at x=0
+            ax.axvline(x=0, color="black", linestyle="--", alpha=0.5)
 
-            # Grid
-            ax_size.grid(
-                True,
-                which="both",
-                axis="both",
-                linestyle="dotted",
-                color="#8B949E",
-                alpha=0.7,
-            )
-            ax_diff.grid(
-                True,
-                which="both",
-                axis="both",
-                linestyle="dotted",
-                color="#8B949E",
-                alpha=0.7,
-            )
+        fig, axes = self.plot_figure(plot_test)
+        axes[-1].set_xlabel("Size Difference (bytes)", fontsize=12, color=BLACK)
+        plt.tight_layout()
+        plt.savefig(plot_file)
+        plt.close(fig)
 
-            # Add vertical line at x=0 for difference plot
-            ax_diff.axvline(x=0, color="black", linestyle="--", alpha=0.5)
+    def plot_results(self, results_file, plot_dir):
+        self.plot_sizes(results_file, plot_dir)
+        self.plot_diffs(results_file, plot_dir)
 
-        # Common x-axis labels
-        axes_size[-1].set_xlabel("Function Size (bytes)", fontsize=12, color=BLACK)
-        axes_diff[-1].set_xlabel("Size Difference (bytes)", fontsize=12, color=BLACK)
 
-        # Adjust layout
-        plt.figure(fig_size.number)
-        plt.tight_layout()
-        plt.figure(fig_diff.number)
-        plt.tight_layout()
+def write_results(index):
+    extractor, results_files, _ = EXTRACTORS[index]
+    extractor.write_results(*results_files)
+
+
+def plot_results(index, plot_file):
+    extractor, results_files, _ = EXTRACTORS[index]
+    plot = extractor.plots()[plot_file]
+    render_plot(extractor, plot, results_files[0], os.path.join(PLOT_PATH, plot_file))
+
+
+def merge_results(index):
+    extractor, results_files, _ = EXTRACTORS[index]
+    extractor.merge_results(results_files[0])
+
+
+# Metrics of the suite summary, by the extractors of their samples
+SUMMARY_EXTRACTORS = [
+    RuntimeResultsExtractor,
+    CompileTimeResultsExtractor,
+    MemoryUsageResultsExtractor,
+    ObjectSizeResultsExtractor,
+]
+SUMMARY_COLUMNS = ["Metric", "Change", "Low", "High", "Tests"]
+
+
+def test_weight(weights, test):
+    # Weights are given by test name, with or without its version (e.g. z3-1.0)
+    return weights.get(test, weights.get(re.sub(r"-\d+(\.\d+)*$", "", test), 1.0))
+
 
-        # Save the figures
-        plt.figure(fig_size.number)
-        plt.savefig(plot_file_size)
-        plt.figure(fig_diff.number)
-        plt.savefig(plot_file_diff)
-        plt.close("all")
+def write_summary(summary_file, summary_json_file):
+    import regression_stats
+
+    print(f"Writing suite summary to {summary_file} and {summary_json_file}")
+    extractors = {type(extractor): extractor for extractor, _, _ in EXTRACTORS}
+
+    # Weighted geometric mean of the changes of the tests of each metric
+    rows = []
+    for extractor in SUMMARY_EXTRACTORS:
+        tests = extractors[extractor].pairs()
+        weights = {test: test_weight(WEIGHTS, test) for test in tests}
+        rows.append(
+            (extractor.metric,) + regression_stats.geomean_change(tests, weights)
+        )
+
+    df = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    results_store.write_metric(results_dir, "summary", df.assign(Flag=FLAG))
+    results_store.export_csv(df, summary_file)
+
+    summary = {
+        metric: {
+            "change": None if np.isnan(change) else change,
+            "low": None if np.isnan(low) else low,
+            "high": None if np.isnan(high) else high,
+            "tests": tests,
+        }
+        for metric, change, low, high, tests in rows
+    }
+    with open(summary_json_file, "w") as f:
+        json.dump({"flag": FLAG, "weights": WEIGHTS, "metrics": summary}, f, indent=2)
+        f.write("\n")
 
 
 if __name__ == "__main__":
@@ -1007,14 +1986,63 @@ if __name__ == "__main__":
     parser.add_argument("test_profiles_dir", type=str, help="Test profiles directory")
     parser.add_argument("optimization_flag", type=str, help="Optimization flag")
     parser.add_argument(
-        "-c", "--csv", action="store_true", help="Plot results from CSV"
+        "-c",
+        "--csv",
+        action="store_true",
+        help="Plot and merge previously stored results, without writing them",
     )
     parser.add_argument(
         "-m", "--merge", action="store_true", help="Merge results across profiles"
     )
+    parser.add_argument(
+        "-s",
+        "--store",
+        action="store_true",
+        help="Also write the statistics, the suite summary and the results store (implied by -p and -m)",
+    )
     parser.add_argument(
         "-p", "--plot", action="store_true", help="Plot results using matplotlib"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=len(os.sched_getaffinity(0)),
+        help="Number of parallel jobs (defaults to the number of usable CPUs)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of the cache of parsed results files",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="Maximum size of the cache (in MB)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Parse every results file again"
+    )
+    parser.add_argument(
+        "--weights",
+        type=str,
+        default=None,
+        help="JSON file with the weight of each test in the suite summary (1 by default)",
+    )
+    parser.add_argument(
+        "--tests",
+        type=str,
+        default=None,
+        help="File with the tests to extract, one per line (e.g. those whose results are complete)",
+    )
+    parser.add_argument(
+        "--top-tus",
+        type=int,
+        default=10,
+        help="Number of top regressing translation units to report per test",
+    )
     args = parser.parse_args()
 
     # Check if the argument is a file
@@ -1023,58 +2051,173 @@ if __name__ == "__main__":
         print(f"Results directory {results_dir} does not exist!")
         exit(1)
 
+    if args.weights and not os.path.exists(args.weights):
+        print(f"Weights file {args.weights} does not exist!")
+        exit(1)
+
+    if args.tests and not os.path.exists(args.tests):
+        print(f"Tests file {args.tests} does not exist!")
+        exit(1)
+
     FLAG = args.optimization_flag.replace("-", "")
 
+    WEIGHTS = {}
+    if args.weights:
+        with open(args.weights, "r") as f:
+            WEIGHTS = json.load(f)
+
+    if args.tests:
+        with open(args.tests, "r") as f:
+            TESTS = {line.strip() for line in f if line.strip()}
+
+    # Plots and merges read the store, so only a CSV-only run skips it, along
+    # with the statistics and the summary (which bootstrap every test)
+    STORE = not args.csv and (args.store or args.plot or args.merge)
+
     CSV_PATH = results_dir + "/csv"
     RUNTIME_RESULTS_FILE = CSV_PATH + "/runtime-results.csv"
+    RUNTIME_STATS_FILE = CSV_PATH + "/runtime-stats.csv"
     COMPILE_TIME_RESULTS_FILE = CSV_PATH + "/compile-time-results.csv"
+    COMPILE_TIME_STATS_FILE = CSV_PATH + "/compile-time-stats.csv"
+    COMPILE_TIME_TU_RESULTS_FILE = CSV_PATH + "/compile-time-tu-results.csv"
+    COMPILE_TIME_TOP_TU_RESULTS_FILE = CSV_PATH + "/compile-time-top-tu-results.csv"
+    TIME_TRACE_RESULTS_FILE = CSV_PATH + "/time-trace-results.csv"
     OBJECT_SIZE_RESULTS_FILE = CSV_PATH + "/object-size-results.csv"
+    SECTION_SIZE_RESULTS_FILE = CSV_PATH + "/section-size-results.csv"
     MEMORY_USAGE_RESULTS_FILE = CSV_PATH + "/memory-usage-results.csv"
     ASM_SIZE_RESULTS_FILE = CSV_PATH + "/asm-size-results.csv"
     TEST_INFO_FILE = CSV_PATH + "/test-info.csv"
+    SUMMARY_FILE = CSV_PATH + "/summary.csv"
+    SUMMARY_JSON_FILE = results_dir + "/summary.json"
 
     # Create the csv directory if it does not exist already
     if not os.path.exists(CSV_PATH):
         os.makedirs(CSV_PATH)
 
-    compile_time = CompileTimeResultsExtractor(results_dir)
-    runtime = RuntimeResultsExtractor(results_dir)
-    object_size = ObjectSizeResultsExtractor(results_dir)
-    memory_usage = MemoryUsageResultsExtractor(results_dir)
-    asm_size = AsmSizeResultsExtractor(results_dir)
-    test_info = TestInfoExtractor(results_dir, args.test_profiles_dir)
+    if not args.no_cache:
+        CACHE = ExtractionCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    # numpy and pandas are used by every extractor, but are slow to import, so
+    # only import them once the arguments are valid (and before forking the
+    # workers, which share them)
+    import numpy as np
+    import pandas as pd
+
+    executor = None
+    if args.jobs > 1:
+        # Fork the workers before starting any thread, as they only need the
+        # module state and the globals set above
+        executor = ProcessPoolExecutor(
+            args.jobs, mp_context=multiprocessing.get_context("fork")
+        )
+        executor.submit(int).result()
+
+    # Each extractor with its results files, and whether it can be plotted and merged
+    extractors = [
+        (
+            CompileTimeResultsExtractor,
+            {},
+            [COMPILE_TIME_RESULTS_FILE, COMPILE_TIME_STATS_FILE],
+            True,
+        ),
+        (
+            CompileTimeTUResultsExtractor,
+            {"top_n": args.top_tus},
+            [COMPILE_TIME_TU_RESULTS_FILE, COMPILE_TIME_TOP_TU_RESULTS_FILE],
+            False,
+        ),
+        (
+            RuntimeResultsExtractor,
+            {},
+            [RUNTIME_RESULTS_FILE, RUNTIME_STATS_FILE],
+            True,
+        ),
+        (ObjectSizeResultsExtractor, {}, [OBJECT_SIZE_RESULTS_FILE], True),
+        (SectionSizeResultsExtractor, {}, [SECTION_SIZE_RESULTS_FILE], True),
+        (MemoryUsageResultsExtractor, {}, [MEMORY_USAGE_RESULTS_FILE], True),
+        (AsmSizeResultsExtractor, {}, [ASM_SIZE_RESULTS_FILE], True),
+        (
+            TestInfoExtractor,
+            {"test_profiles_dir": args.test_profiles_dir},
+            [TEST_INFO_FILE],
+            False,
+        ),
+    ]
+    # Time traces are opt-in (run-all.sh --time-trace)
+    if os.path.isdir(results_dir + "/time-trace"):
+        extractors.append(
+            (TimeTraceResultsExtractor, {}, [TIME_TRACE_RESULTS_FILE], True)
+        )
 
-    if not args.csv:
-        compile_time.write_results(COMPILE_TIME_RESULTS_FILE)
-        runtime.write_results(RUNTIME_RESULTS_FILE)
-        object_size.write_results(OBJECT_SIZE_RESULTS_FILE)
-        memory_usage.write_results(MEMORY_USAGE_RESULTS_FILE)
-        asm_size.write_results(ASM_SIZE_RESULTS_FILE)
-        test_info.write_results(TEST_INFO_FILE)
-    else:
-        for results_file in [
-            COMPILE_TIME_RESULTS_FILE,
-            RUNTIME_RESULTS_FILE,
-            OBJECT_SIZE_RESULTS_FILE,
-            ASM_SIZE_RESULTS_FILE,
+    # Compute the extractors concurrently, each one fanning out its tests to
+    # the process pool
+    with ThreadPoolExecutor(len(extractors)) as threads:
+        futures = [
+            threads.submit(extractor, results_dir, executor, **kwargs)
+            for extractor, kwargs, _, _ in extractors
+        ]
+        EXTRACTORS = [
+            (future.result(), results_files, plot)
+            for future, (_, _, results_files, plot) in zip(futures, extractors)
+        ]
+    if executor is not None:
+        executor.shutdown()
+    if CACHE is not None:
+        CACHE.evict()
+
+    if args.csv:
+        run = results_store.load_run(results_dir)
+        for metric in [
+            CompileTimeResultsExtractor.metric,
+            "compile-time-stats",
+            RuntimeResultsExtractor.metric,
+            "runtime-stats",
+            ObjectSizeResultsExtractor.metric,
+            SectionSizeResultsExtractor.metric,
+            AsmSizeResultsExtractor.metric,
         ]:
-            if not os.path.exists(results_file):
-                print(f"Results file {results_file} does not exist!")
+            if metric not in run:
+                print(f"Stored {metric} results do not exist!")
                 exit(1)
 
-    if args.plot:
-        PLOT_PATH = results_dir + "/plots"
-        if not os.path.exists(PLOT_PATH):
-            os.makedirs(PLOT_PATH)
-
-        compile_time.plot_results(COMPILE_TIME_RESULTS_FILE, PLOT_PATH)
-        runtime.plot_results(RUNTIME_RESULTS_FILE, PLOT_PATH)
-        object_size.plot_results(OBJECT_SIZE_RESULTS_FILE, PLOT_PATH)
-        memory_usage.plot_results(MEMORY_USAGE_RESULTS_FILE, PLOT_PATH)
-        asm_size.plot_results(ASM_SIZE_RESULTS_FILE, PLOT_PATH)
-
-    if args.merge:
-        compile_time.merge_results(COMPILE_TIME_RESULTS_FILE)
-        runtime.merge_results(RUNTIME_RESULTS_FILE)
-        object_size.merge_results(OBJECT_SIZE_RESULTS_FILE)
-        memory_usage.merge_results(MEMORY_USAGE_RESULTS_FILE)
+    PLOT_PATH = results_dir + "/plots"
+    if args.plot and not os.path.exists(PLOT_PATH):
+        os.makedirs(PLOT_PATH)
+
+    # Write the results of each extractor, and then render each plot and merge
+    # the results of each extractor from the store, all in their own process,
+    # forked after the results are computed
+    tasks = []
+    if not args.csv:
+        tasks.append([(write_results, index) for index in range(len(EXTRACTORS))])
+        if STORE:
+            tasks[-1].append((write_summary, SUMMARY_FILE, SUMMARY_JSON_FILE))
+    stage = []
+    for index, (extractor, _, plot) in enumerate(EXTRACTORS):
+        if plot and args.plot:
+            stage += [(plot_results, index, plot_file) for plot_file in extractor.plots()]
+        if plot and args.merge:
+            stage.append((merge_results, index))
+    tasks.append(stage)
+
+    # The statistics and the store (pyarrow) are only used when storing,
+    # plotting or merging, so only import them then, before forking the
+    # workers that share them
+    if STORE or args.plot or args.merge:
+        import pyarrow.dataset
+        import pyarrow.parquet
+    if STORE:
+        import regression_stats
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(
+            args.jobs, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            for stage in tasks:
+                futures = [executor.submit(*task) for task in stage]
+                for future in futures:
+                    future.result()
+    else:
+        for stage in tasks:
+            for function, *task_args in stage:
+                function(*task_args)
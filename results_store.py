@@ -0,0 +1,178 @@
+import csv
+import functools
+import operator
+import os
+
+# Datasets are partitioned by these columns, when a metric has them
+PARTITION_COLUMNS = ("Test", "Profile", "Flag")
+
+# Name columns stored dictionary encoded, and loaded as categoricals
+CATEGORICAL_COLUMNS = (
+    "Test",
+    "Profile",
+    "Flag",
+    "Description",
+    "Scale",
+    "Proportion",
+    "Function",
+    "Section",
+    "Pass",
+    "Input",
+    "Verdict",
+    "Metric",
+)
+
+
+def store_dir(results_dir):
+    return os.path.join(results_dir, "store")
+
+
+def partition_digests(df, partition_columns, columns):
+    import pandas as pd
+
+    # Hash of the rows of each partition, in order
+    return {
+        key: pd.util.hash_pandas_object(
+            group[columns].reset_index(drop=True), index=False
+        ).values.tobytes()
+        for key, group in df.groupby(partition_columns, observed=True, sort=False)
+    }
+
+
+def changed_rows(results_dir, metric, df, partition_columns):
+    # Rows of the partitions of df that differ from the stored ones
+    import pandas as pd
+
+    columns = list(df.columns)
+    digests = partition_digests(df, partition_columns, columns)
+
+    # Only read the stored partitions of df, as the metric may be written
+    # once per test (e.g. asm-size)
+    stored = load_metric(results_dir, metric, partition_columns, list(digests))
+    if stored is None or not set(df.columns) <= set(stored.columns):
+        return df
+
+    stored_digests = partition_digests(stored, partition_columns, columns)
+    changed = [
+        key for key, digest in digests.items() if stored_digests.get(key) != digest
+    ]
+    keys = pd.MultiIndex.from_frame(df[partition_columns])
+    return df[keys.isin(changed)]
+
+
+def write_metric(results_dir, metric, df):
+    # pyarrow is only imported when the store is used, as it is slow to import
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Replace the partitions of the metric present in df, keeping the others
+    # (e.g. the results of other optimization flags)
+    df = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+
+    partition_columns = [column for column in PARTITION_COLUMNS if column in df]
+
+    # Only rewrite the partitions whose rows changed, so that updating the
+    # results of a test leaves the files of the other tests untouched
+    if partition_columns and len(df) > 0:
+        df = changed_rows(results_dir, metric, df, partition_columns)
+
+    if len(df) > 0:
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            os.path.join(store_dir(results_dir), metric),
+            partition_cols=partition_columns,
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet",
+        )
+
+    load_run(results_dir).frames.pop(metric, None)
+
+
+def load_metric(results_dir, metric, partition_columns=None, keys=None):
+    # Rows of a metric, or only of the partitions with the given keys
+    import pyarrow.dataset as pds
+
+    path = os.path.join(store_dir(results_dir), metric)
+    if not os.path.isdir(path):
+        return None
+
+    dataset = pds.dataset(
+        path,
+        format="parquet",
+        partitioning=pds.HivePartitioning.discover(infer_dictionary=True),
+    )
+    expression = None
+    if keys is not None:
+        for key in keys:
+            match = functools.reduce(
+                operator.and_,
+                (
+                    pds.field(column) == value
+                    for column, value in zip(partition_columns, key)
+                ),
+            )
+            expression = match if expression is None else expression | match
+        if expression is None:
+            return None
+    df = dataset.to_table(filter=expression).to_pandas()
+
+    # Order categories by name, so that sorting by a categorical column
+    # matches sorting the names
+    for column in df.select_dtypes("category").columns:
+        df[column] = df[column].cat.remove_unused_categories()
+        df[column] = df[column].cat.reorder_categories(
+            sorted(df[column].cat.categories)
+        )
+
+    return df
+
+
+class Run:
+    def __init__(self, results_dir):
+        self.results_dir = results_dir
+        self.frames = {}
+
+    def metrics(self):
+        path = store_dir(self.results_dir)
+        if not os.path.isdir(path):
+            return []
+        return sorted(entry.name for entry in os.scandir(path) if entry.is_dir())
+
+    def __contains__(self, metric):
+        return metric in self.metrics()
+
+    def __getitem__(self, metric):
+        # Each dataset is only parsed once, until it is written again
+        if metric not in self.frames:
+            df = load_metric(self.results_dir, metric)
+            if df is None:
+                raise KeyError(metric)
+            self.frames[metric] = df
+        return self.frames[metric]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_run(results_dir):
+    return Run(results_dir)
+
+
+def load_run(results_dir):
+    # Memoized view of the datasets of a results directory, e.g. for notebooks:
+    #   load_run("results")["runtime"]
+    return _load_run(os.path.abspath(results_dir))
+
+
+def export_csv(df, results_file, header=True):
+    # Semicolon separated view of a dataset, escaping separators in names
+    df.to_csv(
+        results_file,
+        sep=";",
+        header=header,
+        index=False,
+        quoting=csv.QUOTE_NONE,
+        escapechar="\\",
+        na_rep="nan",
+    )
@@ -18,17 +18,544 @@ usage() {
     echo "  -p, --prepare                 Tweak environment to decrease result variance (needs sudo)"
     echo "  -i, --install-only            Only install the tests"
     echo "  -r, --follow-inline-remarks   Follow baseline inline marks in prototype"
+    echo "  -n, --no-inline-remarks       Skip the (unmeasured) inline remarks install round"
+    echo "  -t, --time-trace              Collect -ftime-trace pass timings in an unmeasured round"
+    echo "  -a, --adaptive                Add install and run rounds until the results are precise enough"
+    echo "      --ci-width <pct>          Target width of the compile time confidence interval, and"
+    echo "                                runtime standard deviation threshold (adaptive, default: 2)"
+    echo "      --max-rounds <n>          Maximum number of install rounds (adaptive, default: 10)"
+    echo "      --round-budget <min>      Time budget of the install rounds of a test (adaptive, default: 60)"
+    echo "      --run-budget <min>        Longest test whose runs are still added (adaptive, default: 20)"
+    echo "      --interleave <order>      Run the runtime trials of both configs interleaved, in abba or random order"
+    echo "      --trials <n>              Number of interleaved runtime trials of each config (default: 8)"
+    echo "      --trial-runs <n>          Number of runs of each interleaved trial (default: 1)"
+    echo "  -j, --jobs <n>                Number of (test, config) pairs installed at once, each on its"
+    echo "                                own CPU set (default: 1)"
+    echo "      --runtime-cpu <cpu>       Core reserved for the runtime measurements (default: the core"
+    echo "                                of the base PIN_CMD, or 0)"
+    echo "      --no-build-cache          Always install the baseline, instead of restoring it from the build cache"
+    echo "      --build-cache-size <MB>   Maximum build cache size (default: 51200)"
+    echo "      --publish-every <n>       Commit and push the results every n tests (default: 5)"
+    echo "      --publish-interval <min>  Commit and push the results at least every min minutes (default: 60)"
+    echo "      --resume                  Resume the last run, skipping the stages in its journal"
     echo "  -h, --help                    Display this message"
     exit 1
 }
 
+# Configs of each runtime trial, in order: ABBA alternates the configs between
+# trials, and random shuffles them in each trial
+trial_order() {
+    local trial=$1
+    if [ "$interleave" = "random" ]; then
+        shuf -e $BASE_CONFIG $OTHER_CONFIG | tr '\n' ' '
+    elif (( trial % 2 )); then
+        echo "$BASE_CONFIG $OTHER_CONFIG"
+    else
+        echo "$OTHER_CONFIG $BASE_CONFIG"
+    fi
+}
+
+# Run a runtime trial of a test with a config, on the core reserved for runtime
+# (the same for both configs). The results are identified by <config>@<trial>,
+# so that results-to-csv.py pairs the trials of both configs
+run_trial() {
+    local p=$1 c=$2 trial=$3
+    local config_name=$(basename "$c" .json)
+    echo "Running $p with $config_name (trial $trial/$trials) on CPU $RUNTIME_CPUS"
+    echo -n $(echo $p | cut -d'/' -f2)"_" | on_cpus "$RUNTIME_CPUS" env \
+        PTS_SILENT_MODE=$PTS_SILENT_MODE \
+        TEST_RESULTS_NAME=$TEST_RESULTS_NAME \
+        TEST_RESULTS_IDENTIFIER=$config_name@$trial \
+        PTS_TEST_INSTALL_ROOT_PATH=$INSTALL_PATH/installed-tests/$config_name/ \
+        NUM_CPU_CORES=1 \
+        FORCE_TIMES_TO_RUN=$trial_runs \
+        $PTS batch-run $p
+}
+
+# Run a command on a CPU set, if any
+on_cpus() {
+    local cpus=$1
+    shift
+    if [ -n "$cpus" ]; then
+        taskset -c $cpus "$@"
+    else
+        "$@"
+    fi
+}
+
+# Value of a PTS user option, from the user configuration
+pts_user_config() {
+    sed -n "s:.*<$1>\(.*\)</$1>.*:\1:p" ~/.phoronix-test-suite/user-config.xml 2>/dev/null | head -1
+}
+
+# Restore the PTS user options changed by the run
+restore_pts_user_config() {
+    for option in "${saved_pts_options[@]}"; do
+        $PTS user-config-set "$option"
+    done
+}
+
+# Export the environment of a config for a test
+setup_config() {
+    local p=$1 c=$2
+
+    # Parse the config file
+    export CONFIG_NAME=$(basename "$c" .json)
+    export LLVM_PATH=$(jq -r '.LLVM_PATH' "$c")
+    export FLAGS=$(jq -r '.FLAGS' "$c")
+    export OPT_FLAG=$(jq -r '.OPT_FLAG' "$c")
+    export NUM_CPU_CORES=$(jq -r '.NUM_CPU_CORES' "$c")
+    export PIN_CMD=$(jq -r '.PIN_CMD' "$c")
+
+    # Export profile name to be used as a identifier in phoronix
+    export TEST_RESULTS_IDENTIFIER=$CONFIG_NAME
+
+    # Override PTS install directory
+    export PTS_TEST_INSTALL_ROOT_PATH=$INSTALL_PATH/installed-tests/$CONFIG_NAME/
+    [ ! -d $PTS_TEST_INSTALL_ROOT_PATH ] && mkdir -p $PTS_TEST_INSTALL_ROOT_PATH
+    INSTALL_DIR=$PTS_TEST_INSTALL_ROOT_PATH"$p"
+
+    # Export basename variable, used to measure compile time in toolchain/
+    export basename=$(basename $p)
+
+    # Point to the toolchain wrappers
+    export CC=$TOOLCHAIN_PATH/clang
+    export CXX=$TOOLCHAIN_PATH/clang++
+
+    # Set compiler flags
+    export CFLAGS=$FLAGS" "$OPT_FLAG
+    export CXXFLAGS=$FLAGS" "$OPT_FLAG
+
+    # Inline remarks of the config (or of the baseline, when followed)
+    INLINE_REMARKS_DIR=$RESULTS_REPO/inline-remarks/$(echo $p | cut -d'/' -f2)/${CONFIG_NAME}
+    [ ! -d $INLINE_REMARKS_DIR ] && mkdir -p $INLINE_REMARKS_DIR
+    INLINE_REMARKS_FILE=$INLINE_REMARKS_DIR/$(echo $OPT_FLAG | tr -d -).txt
+    if [ "$CONFIG_NAME" = "byte" ] && [ $follow_inline_remarks -eq 1 ]; then
+        INLINE_REMARKS_FILE=$RESULTS_REPO/inline-remarks/$(echo $p | cut -d'/' -f2)/base/$(echo $OPT_FLAG | tr -d '-').txt
+        CFLAGS="$CFLAGS -mllvm -cgscc-inline-replay=$INLINE_REMARKS_FILE"
+    fi
+
+    # Outputs of the stages
+    RECORD_FILE=$RESULTS_REPO/compile-records/$(basename $p)/$CONFIG_NAME/$(echo $OPT_FLAG | tr -d '-').jsonl
+    MANIFEST_FILE=$INSTALL_DIR.elf-manifest
+    SIZE_FILE=$RESULTS_REPO/object-size/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME/$(echo $OPT_FLAG | tr -d '-').txt
+    SECTION_SIZE_FILE=$RESULTS_REPO/section-size/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME/$(echo $OPT_FLAG | tr -d '-').txt
+    ASM_FILE=$RESULTS_REPO/asm-diff/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME/$(echo $OPT_FLAG | tr -d '-')/sizes.txt
+    ASM_DIFF_DIR=$RESULTS_REPO/asm-diff/$(echo $p | cut -d'/' -f2)/$(echo $OPT_FLAG | tr -d '-')
+}
+
+# Record a completed stage of a test with a config (- for both configs) in the
+# journal of the run
+journal() {
+    (
+        flock 200
+        echo "$*" >> $JOURNAL_FILE
+        sync $JOURNAL_FILE
+    ) 200>$JOURNAL_FILE.lock
+}
+
+# Whether a stage is in the journal (of the run being resumed), and its outputs
+# still exist and are not empty
+stage_done() {
+    local stage=$1
+    shift
+    grep -qxF "$stage" $JOURNAL_FILE || return 1
+    for output in "$@"; do
+        [ -s "$output" ] || return 1
+    done
+}
+
+# Install a test in rounds, measuring compile time and memory usage, with the
+# compiles on the given CPU set
+install_pair() {
+    local p=$1 cpus=$2
+
+    # Compile with as many jobs as cores in the CPU set
+    [ -n "$cpus" ] && export NUM_CPU_CORES=$(echo $cpus | tr ',' '\n' | wc -l)
+
+    # Collect inline remarks and time traces in separate unmeasured rounds
+    # before the timed ones (0 and the one before), so that the timed rounds
+    # are compiled only once, and the traced compiles without remarks
+    first_round=1
+    unset INLINE_REMARKS_ROUND TIME_TRACE_ROUND
+    [[ $inline_remarks -eq 1 ]] && export INLINE_REMARKS_ROUND=0 && first_round=0
+    [[ $time_trace -eq 1 ]] && first_round=$((first_round - 1)) && TIME_TRACE_ROUND=$first_round
+    TIME_TRACE_DIR=$INSTALL_PATH/time-trace/$CONFIG_NAME/$p
+    [[ $install_only -eq 1 ]] && rounds=1 || rounds=3
+    [[ $adaptive -eq 1 && $install_only -eq 0 ]] && rounds=$max_rounds
+
+    # Resume after the last install round in the journal, dropping the
+    # records of the interrupted round
+    for ((resume_round=first_round; resume_round<=rounds; resume_round++)); do
+        stage_done "$p $CONFIG_NAME install-$resume_round" || break
+    done
+    if [ $resume_round -gt $first_round ] && [ -f $RECORD_FILE ]; then
+        echo "Resuming the install of $p with $CONFIG_NAME at round $resume_round"
+        jq -c "select((.round | tonumber) < $resume_round)" $RECORD_FILE > $RECORD_FILE.tmp
+        mv $RECORD_FILE.tmp $RECORD_FILE
+    else
+        resume_round=$first_round
+
+        # Refresh inline remarks, time traces and compile records
+        [[ "$CONFIG_NAME" != "byte" || $follow_inline_remarks -eq 0 ]] && rm -f $INLINE_REMARKS_FILE
+        rm -rf $TIME_TRACE_DIR
+        rm -f $RECORD_FILE
+    fi
+
+    # Install and measure compile time and memory usage
+    ROUNDS_DIR=$RESULTS_REPO/rounds/$(basename $p)/$CONFIG_NAME
+    [ ! -d $ROUNDS_DIR ] && mkdir -p $ROUNDS_DIR
+    start=$SECONDS
+    for ((i=resume_round; i<=rounds; i++)); do
+        echo "Installing $p with $CONFIG_NAME ($i/$rounds)${cpus:+ on CPUs $cpus}"
+        rm -rf $INSTALL_DIR
+        export INSTALL_ROUND=$i
+        if [[ $time_trace -eq 1 && $i -eq $TIME_TRACE_ROUND ]]; then
+            TIME_TRACE_DIR=$TIME_TRACE_DIR on_cpus "$cpus" $PTS batch-install $p
+        else
+            on_cpus "$cpus" $PTS batch-install $p
+        fi
+        journal "$p $CONFIG_NAME install-$i"
+
+        # Stop adding rounds once the compile time is precise enough, or
+        # the time budget is spent (recording the number of rounds)
+        if [[ $adaptive -eq 1 && $install_only -eq 0 && $i -gt 0 ]]; then
+            python3 check-precision.py --threshold $ci_width \
+                --output $ROUNDS_DIR/$(echo $OPT_FLAG | tr -d '-').json \
+                $RECORD_FILE && break
+            (( SECONDS - start >= round_budget * 60 )) && echo "Round budget of $p is spent" && break
+        fi
+    done
+
+    # Sum the time spent in each pass/phase over all translation units
+    if [[ $time_trace -eq 1 && -d $TIME_TRACE_DIR ]]; then
+        TRACE_RESULTS_DIR=$RESULTS_REPO/time-trace/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME
+        [ ! -d $TRACE_RESULTS_DIR ] && mkdir -p $TRACE_RESULTS_DIR
+        python3 time-trace.py --remove $TIME_TRACE_DIR $TRACE_RESULTS_DIR/$(echo $OPT_FLAG | tr -d '-').txt
+    fi
+}
+
+# Measure the object and section sizes of an installed test. Outputs are
+# written to a temporary file and renamed, so that an interrupted stage never
+# leaves a partial output behind
+size_pair() {
+    # List the installed ELF files once (path, size, type and build-id)
+    python3 elf-manifest.py $INSTALL_DIR $MANIFEST_FILE.tmp && mv $MANIFEST_FILE.tmp $MANIFEST_FILE
+
+    # Measure object size
+    [ ! -d $(dirname $SIZE_FILE) ] && mkdir -p $(dirname $SIZE_FILE)
+    awk -F'\t' '{print $2 "\t" $1}' $MANIFEST_FILE > $SIZE_FILE.tmp && mv $SIZE_FILE.tmp $SIZE_FILE
+
+    # Measure object size per ELF section
+    [ ! -d $(dirname $SECTION_SIZE_FILE) ] && mkdir -p $(dirname $SECTION_SIZE_FILE)
+    python3 section-sizes.py $MANIFEST_FILE $SECTION_SIZE_FILE.tmp && mv $SECTION_SIZE_FILE.tmp $SECTION_SIZE_FILE
+}
+
+# Measure the asm function sizes of an installed test
+asm_pair() {
+    [ ! -d $(dirname $ASM_FILE) ] && mkdir -p $(dirname $ASM_FILE)
+    python3 asm-sizes.py $MANIFEST_FILE $ASM_FILE.tmp && mv $ASM_FILE.tmp $ASM_FILE
+}
+
+# Run a test with a single CPU core, on the core reserved for runtime
+run_pair() {
+    local p=$1
+    echo "Running $p with $CONFIG_NAME${RUNTIME_CPUS:+ on CPU $RUNTIME_CPUS}"
+    result_name=`echo $p | cut -d'/' -f2`"_"
+    echo -n $result_name | NUM_CPU_CORES=1 on_cpus "$RUNTIME_CPUS" $PTS batch-run $p
+}
+
+# Interleave the runtime trials of both configs, so that drift in the machine
+# state (thermal, page cache, background daemons) affects both. Each trial is
+# journaled, so that a resumed run does not add the same trial twice
+run_trials() {
+    local p=$1
+    for ((trial=1; trial<=trials; trial++)); do
+        for c in $(trial_order $trial); do
+            stage_done "$p $(basename $c .json) trial-$trial" && continue
+            run_trial $p $c $trial
+            journal "$p $(basename $c .json) trial-$trial"
+        done
+    done
+}
+
+# Compare the assembly generated by both configs
+diff_profile() {
+    local p=$1
+    test_name=$(echo $p | cut -d'/' -f2)
+    echo "Comparing assembly for $test_name..."
+
+    [ ! -d $ASM_DIFF_DIR ] && mkdir -p $ASM_DIFF_DIR
+
+    # Define paths to installed binaries for both configurations
+    BASE_DIR=$INSTALL_PATH/installed-tests/$(basename $BASE_CONFIG .json)/$p
+    OTHER_DIR=$INSTALL_PATH/installed-tests/$(basename $OTHER_CONFIG .json)/$p
+
+    # Run assembly comparison with timeout (writes diff.txt, all.txt,
+    # diff_loose.txt and, last, timeout.txt)
+    python3 asm-diff.py --timeout 600 \
+        --base-manifest $BASE_DIR.elf-manifest \
+        --other-manifest $OTHER_DIR.elf-manifest \
+        $BASE_DIR $OTHER_DIR $ASM_DIFF_DIR
+}
+
+# Write README.md
+write_readme() {
+    echo "# $FORMATTED_DATE @ $(hostname)" > $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    [ $follow_inline_remarks -eq 1 ] && checkbox="[x]" || checkbox="[ ]"
+    echo "Follow inline remarks: $checkbox" >> "$RESULTS_REPO/README.md"
+    echo "" >> $RESULTS_REPO/README.md
+    if [ -f $RESULTS_REPO/csv/summary.csv ]; then
+        # Geometric mean of the changes of the prototype across the suite
+        echo "## Summary" >> $RESULTS_REPO/README.md
+        echo "Positive changes are regressions (slower, longer to compile, more memory or larger)." >> $RESULTS_REPO/README.md
+        echo "" >> $RESULTS_REPO/README.md
+        awk -F';' '
+            NR == 1 { print "| Metric | Change | 95% CI | Tests |"; print "|---|---|---|---|"; next }
+            { printf "| %s | %+.2f%% | [%+.2f%%, %+.2f%%] | %d |\n", $1, $2, $3, $4, $5 }
+        ' $RESULTS_REPO/csv/summary.csv >> $RESULTS_REPO/README.md
+        echo "" >> $RESULTS_REPO/README.md
+    fi
+    echo "## Compilation Time" >> $RESULTS_REPO/README.md
+    echo "![Compilation Time](plots/compile-time.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    echo "## Runtime" >> $RESULTS_REPO/README.md
+    echo "![Runtime](plots/runtime.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    if [[ $time_trace -eq 1 ]]; then
+        echo "## Compilation Time per Pass" >> $RESULTS_REPO/README.md
+        echo "![Compilation Time per Pass](plots/time-trace.svg)" >> $RESULTS_REPO/README.md
+        echo "" >> $RESULTS_REPO/README.md
+    fi
+    echo "## Memory Usage" >> $RESULTS_REPO/README.md
+    echo "![Memory Usage](plots/memory-usage.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    echo "## Object Size" >> $RESULTS_REPO/README.md
+    echo "![Object Size](plots/object-size.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    echo "## Section Size" >> $RESULTS_REPO/README.md
+    echo "![Section Size](plots/section-size.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    echo "## ASM Size" >> $RESULTS_REPO/README.md
+    echo "![ASM Size](plots/asm-size.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+    echo "## ASM Diff" >> $RESULTS_REPO/README.md
+    echo "![ASM Diff](plots/asm-diff.svg)" >> $RESULTS_REPO/README.md
+    echo "" >> $RESULTS_REPO/README.md
+}
+
+# List the tests whose results are complete (compared, in the journal), which
+# are the only ones extracted while the other tests are still being installed
+complete_tests() {
+    awk '$2 == "-" && $3 == "diff" { print $1 }' $JOURNAL_FILE | xargs -rn1 basename > $STATE_DIR/complete-tests
+}
+
+# Extract the results of a test to CSV (the statistics, summary, store and
+# plots are only written at checkpoints)
+update_profile() {
+    local p=$1
+
+    # Copy results (while no test is running)
+    (
+        flock 200
+        pushd ~/.phoronix-test-suite
+        xml_file="test-results/$(hostname | cut -d'.' -f1)/composite.xml"
+        target_dir="$RESULTS_REPO/$(dirname $xml_file)/$(echo $OPT_FLAG | tr -d '-')"
+        [ ! -d $target_dir ] && mkdir -p $target_dir
+        cp $xml_file "$target_dir/"
+        popd
+    ) 200>$STATE_DIR/runtime.lock
+
+    # TODO: HARDCODED -O2
+    complete_tests
+    python3 results-to-csv.py --tests $STATE_DIR/complete-tests $RESULTS_REPO $TEST_PROFILES_PATH "O3"
+}
+
+# Plot and merge the results, and commit and push them
+checkpoint() {
+    local message=$1
+
+    # TODO: HARDCODED -O2
+    complete_tests
+    python3 results-to-csv.py --tests $STATE_DIR/complete-tests $RESULTS_REPO $TEST_PROFILES_PATH "O3" -mp
+
+    write_readme
+
+    pushd $RESULTS_REPO
+    find . -name "s,^.*" | xargs rm -rf
+    git add .
+    git commit --no-gpg-sign -m "$message"
+    git push -f
+    popd
+}
+
+# Publish the results of a test, committing and pushing a checkpoint every
+# --publish-every tests or --publish-interval minutes
+publish_profile() {
+    local p=$1
+    update_profile $p
+    echo $p >> $STATE_DIR/unpublished
+    if [ $(wc -l < $STATE_DIR/unpublished) -ge $publish_every ] || \
+        (( $(date +%s) - $(stat -c %Y $STATE_DIR/checkpoint) >= publish_interval * 60 )); then
+        checkpoint "$CONFIG_NAME($(echo $OPT_FLAG | tr -d '-')): $(paste -sd' ' $STATE_DIR/unpublished)"
+        : > $STATE_DIR/unpublished
+        touch $STATE_DIR/checkpoint
+    fi
+}
+
+# Install, measure and run a test with a config on an install slot. Runs are
+# queued on the core reserved for runtime, and the last config of a test to
+# finish compares and publishes it
+pair_job() {
+    local p=$1 c=$2 cpus=$3
+    local pair=$STATE_DIR/$(basename $p)
+    local cache_key=""
+    setup_config $p $c
+
+    # Keep every stage of the job (and the worker pools they start) on the CPU
+    # set of its slot, off the runtime core; only runs move to the latter
+    [ -n "$cpus" ] && taskset -pc $cpus $BASHPID > /dev/null
+
+    # Wait for the inline remarks of the baseline to be collected
+    if [ "$CONFIG_NAME" = "byte" ] && [ $follow_inline_remarks -eq 1 ]; then
+        while [ ! -f $pair.$(basename $BASE_CONFIG .json).installed ]; do sleep 10; done
+    fi
+
+    # Skip the stages in the journal of the run being resumed, whose outputs
+    # still exist
+    if stage_done "$p $CONFIG_NAME install" $INSTALL_DIR $RECORD_FILE; then
+        echo "Skipping the install of $p with $CONFIG_NAME"
+    else
+        # Restore the baseline install and its measurements from the build
+        # cache, when it was built with the same compiler, flags, test profile
+        # and settings
+        local restored=0
+        if [ "$c" = "$BASE_CONFIG" ] && [[ $build_cache -eq 1 && $install_only -eq 0 ]]; then
+            # Compile time and memory usage depend on the cores of the slot,
+            # and on how many other slots compile at once
+            local compile_cores=$NUM_CPU_CORES
+            [ -n "$cpus" ] && compile_cores=$(echo $cpus | tr ',' '\n' | wc -l)
+            cache_key=$(python3 build-cache.py key \
+                --llvm-path $LLVM_PATH --toolchain-path $TOOLCHAIN_PATH --flags="$FLAGS" --opt-flag="$OPT_FLAG" \
+                --test-profile $TEST_PROFILES_PATH/$p --install-dir $INSTALL_DIR \
+                --extra "inline-remarks=$inline_remarks time-trace=$time_trace adaptive=$adaptive ci-width=$ci_width max-rounds=$max_rounds round-budget=$round_budget jobs=$jobs cores=$compile_cores")
+            [ -n "$cache_key" ] && python3 build-cache.py --cache-size $build_cache_size restore \
+                $cache_key $INSTALL_DIR $RESULTS_REPO $(basename $p) $CONFIG_NAME $(echo $OPT_FLAG | tr -d '-') && restored=1
+        fi
+
+        if [ $restored -eq 1 ]; then
+            cache_key=""
+            journal "$p $CONFIG_NAME size"
+            journal "$p $CONFIG_NAME asm"
+        else
+            install_pair $p "$cpus"
+        fi
+        journal "$p $CONFIG_NAME install"
+    fi
+    touch $pair.$CONFIG_NAME.installed
+
+    # Exit early if install-only is set
+    if [[ $install_only -eq 1 ]]; then
+        echo "Install-only flag is set, skipping test execution and analysis for $p"
+        return
+    fi
+
+    if ! stage_done "$p $CONFIG_NAME size" $MANIFEST_FILE $SIZE_FILE $SECTION_SIZE_FILE; then
+        size_pair
+        journal "$p $CONFIG_NAME size"
+    fi
+    if ! stage_done "$p $CONFIG_NAME asm" $ASM_FILE; then
+        asm_pair
+        journal "$p $CONFIG_NAME asm"
+    fi
+    if [ -n "$cache_key" ]; then
+        python3 build-cache.py --cache-size $build_cache_size store \
+            $cache_key $INSTALL_DIR $RESULTS_REPO $(basename $p) $CONFIG_NAME $(echo $OPT_FLAG | tr -d '-')
+    fi
+
+    # Run the test (unless the runs of both configs are interleaved)
+    if [ -z "$interleave" ] && ! stage_done "$p $CONFIG_NAME run"; then
+        (
+            flock 200
+            run_pair $p
+        ) 200>$STATE_DIR/runtime.lock
+        journal "$p $CONFIG_NAME run"
+    fi
+
+    # Claim the test once both configs are done
+    local last=$(
+        (
+            flock 200
+            touch $pair.$CONFIG_NAME.done
+            if [ -f $pair.$(basename $BASE_CONFIG .json).done ] && [ -f $pair.$(basename $OTHER_CONFIG .json).done ] && [ ! -f $pair.claimed ]; then
+                touch $pair.claimed
+                echo 1
+            fi
+        ) 200>$STATE_DIR/claim.lock
+    )
+    [ -z "$last" ] && return
+
+    setup_config $p $OTHER_CONFIG
+    if [ -n "$interleave" ] && ! stage_done "$p - trials"; then
+        (
+            flock 200
+            run_trials $p
+        ) 200>$STATE_DIR/runtime.lock
+        journal "$p - trials"
+    fi
+    if ! stage_done "$p - diff" $ASM_DIFF_DIR/timeout.txt; then
+        diff_profile $p
+        journal "$p - diff"
+    fi
+    if ! stage_done "$p - publish"; then
+        (
+            flock 200
+            publish_profile $p
+        ) 200>$STATE_DIR/publish.lock
+        journal "$p - publish"
+    fi
+}
+
+# Start a job on the first free install slot, with the CPU set of the slot
+start_job() {
+    while true; do
+        for ((slot=0; slot<jobs; slot++)); do
+            pid=${slot_pids[$slot]}
+            if [ -z "$pid" ] || ! kill -0 $pid 2>/dev/null; then
+                "$@" "${cpu_sets[$slot]}" &
+                slot_pids[$slot]=$!
+                return
+            fi
+        done
+        wait -n
+    done
+}
+
 # Default behavior
 run_prepare=0
 install_only=0
 follow_inline_remarks=0
+inline_remarks=1
+time_trace=0
+adaptive=0
+ci_width=2
+max_rounds=10
+round_budget=60
+run_budget=20
+interleave=""
+trials=8
+trial_runs=1
+jobs=1
+runtime_cpu=""
+build_cache=1
+build_cache_size=51200
+resume=0
+publish_every=5
+publish_interval=60
 
 # Parse command line arguments
-TEMP=$(getopt -o phi --long prepare,help,install-only,follow-inline-remarks -n "$0" -- "$@")
+TEMP=$(getopt -o phirntaj: --long prepare,help,install-only,follow-inline-remarks,no-inline-remarks,time-trace,adaptive,ci-width:,max-rounds:,round-budget:,run-budget:,interleave:,trials:,trial-runs:,jobs:,runtime-cpu:,no-build-cache,build-cache-size:,publish-every:,publish-interval:,resume -n "$0" -- "$@")
 if [ $? != 0 ] ; then echo "Termination..." >&2 ; exit 1 ; fi
 eval set -- "$TEMP"
 
@@ -46,6 +573,74 @@ while true; do
             follow_inline_remarks=1
             shift
         ;;
+        -n | --no-inline-remarks)
+            inline_remarks=0
+            shift
+        ;;
+        -t | --time-trace)
+            time_trace=1
+            shift
+        ;;
+        -a | --adaptive)
+            adaptive=1
+            shift
+        ;;
+        --ci-width)
+            ci_width="$2"
+            shift 2
+        ;;
+        --max-rounds)
+            max_rounds="$2"
+            shift 2
+        ;;
+        --round-budget)
+            round_budget="$2"
+            shift 2
+        ;;
+        --run-budget)
+            run_budget="$2"
+            shift 2
+        ;;
+        --interleave)
+            interleave="$2"
+            shift 2
+        ;;
+        --trials)
+            trials="$2"
+            shift 2
+        ;;
+        --trial-runs)
+            trial_runs="$2"
+            shift 2
+        ;;
+        -j | --jobs)
+            jobs="$2"
+            shift 2
+        ;;
+        --runtime-cpu)
+            runtime_cpu="$2"
+            shift 2
+        ;;
+        --no-build-cache)
+            build_cache=0
+            shift
+        ;;
+        --build-cache-size)
+            build_cache_size="$2"
+            shift 2
+        ;;
+        --publish-every)
+            publish_every="$2"
+            shift 2
+        ;;
+        --publish-interval)
+            publish_interval="$2"
+            shift 2
+        ;;
+        --resume)
+            resume=1
+            shift
+        ;;
         -h | --help)
             usage
         ;;
@@ -79,17 +674,80 @@ export PTS="$PTS_BASE/phoronix-test-suite"
 [ ! -d "$PTS_BASE" ] && echo "PTS not found: $PTS_BASE" && exit 1
 [ ! -d "$TEST_PROFILES_PATH" ] && echo "Test profiles not found: $TEST_PROFILES_PATH" && exit 1
 [ ! -d "$TOOLCHAIN_PATH" ] && echo "Toolchain not found: $TOOLCHAIN_PATH" && exit 1
+[[ -n "$interleave" && "$interleave" != "abba" && "$interleave" != "random" ]] && echo "Unknown interleave order: $interleave" && exit 1
+[ ! -d $(jq -r '.LLVM_PATH' "$BASE_CONFIG") ] && echo "LLVM not found!" && exit 1
+[ ! -d $(jq -r '.LLVM_PATH' "$OTHER_CONFIG") ] && echo "LLVM not found!" && exit 1
+[[ ! "$jobs" =~ ^[1-9][0-9]*$ ]] && echo "Invalid number of jobs: $jobs" && exit 1
+
+# Reserve a core for runtime, where the trials of both configs run when they
+# are interleaved. A single slot otherwise runs unpinned, as the configs may
+# pin the whole script with PIN_CMD
+RUNTIME_CPUS=""
+if [[ $jobs -gt 1 || -n "$interleave" ]]; then
+    [ -z "$runtime_cpu" ] && runtime_cpu=$(jq -r '.PIN_CMD // empty' "$BASE_CONFIG" | grep -oP 'taskset -c \K[0-9]+')
+    [ -z "$runtime_cpu" ] && runtime_cpu=0
+    RUNTIME_CPUS=$runtime_cpu
+fi
+
+# Split the cores of NUM_CPU_CORES, except the one reserved for runtime, into
+# a disjoint CPU set per install slot. A single slot installs on all cores
+declare -a cpu_sets slot_pids
+if [ $jobs -gt 1 ]; then
+    cores=()
+    for ((cpu=0; cpu<$(jq -r '.NUM_CPU_CORES' "$BASE_CONFIG"); cpu++)); do
+        [ $cpu -ne $runtime_cpu ] && cores+=($cpu)
+    done
+    slot_cores=$(( ${#cores[@]} / jobs ))
+    [ $slot_cores -lt 1 ] && echo "Not enough cores for $jobs jobs: ${#cores[@]}" && exit 1
+    for ((slot=0; slot<jobs; slot++)); do
+        cpu_sets[$slot]=$(IFS=,; echo "${cores[*]:slot*slot_cores:slot_cores}")
+        echo "Install slot $slot: CPUs ${cpu_sets[$slot]}"
+    done
+fi
 
 # Prepare environement to decrease result variance (needs sudo)
 [[ $run_prepare -eq 1 ]] && ./prepare-benchmark-env.sh 1
 
-# Create new branch in results repo
+# Let PTS run each test until the standard deviation of its runs is under the
+# threshold (or the test takes longer than the budget), restoring the previous
+# options on exit so that later runs do not inherit them
+declare -a saved_pts_options
+if [[ $adaptive -eq 1 ]]; then
+    for option in DynamicRunCount StandardDeviationThreshold LimitDynamicToTestLength; do
+        value=$(pts_user_config $option)
+        [ -n "$value" ] && saved_pts_options+=("$option=$value")
+    done
+    trap restore_pts_user_config EXIT
+    $PTS user-config-set DynamicRunCount=TRUE
+    $PTS user-config-set StandardDeviationThreshold=$ci_width
+    $PTS user-config-set LimitDynamicToTestLength=$run_budget
+fi
+
+[ ! -d $INSTALL_PATH ] && mkdir $INSTALL_PATH
+
+# Journal of the completed stages of the run, with its start date and branch
+JOURNAL_FILE=$INSTALL_PATH/run-journal
+
 pushd $RESULTS_REPO
-DATE=$(date +%Y-%m-%d-%H-%M-%S)
-FORMATTED_DATE=$(date +"%d %B %Y - %H:%M")
-git checkout --orphan $DATE-$(hostname | cut -d'.' -f1)
-git rm -rf .
-git clean -df
+if [[ $resume -eq 1 ]]; then
+    # Continue on the branch of the run (which has no commits until the first
+    # test is published)
+    [ ! -f $JOURNAL_FILE ] && echo "No run to resume: $JOURNAL_FILE does not exist" && exit 1
+    START=$(awk '$1 == "started" { print $2 }' $JOURNAL_FILE)
+    BRANCH=$(awk '$1 == "branch" { print $2 }' $JOURNAL_FILE)
+    echo "Resuming run on branch $BRANCH"
+    [ "$(git symbolic-ref --short HEAD)" != "$BRANCH" ] && git checkout $BRANCH
+else
+    # Create new branch in results repo
+    START=$(date +%s)
+    BRANCH=$(date -d @$START +%Y-%m-%d-%H-%M-%S)-$(hostname | cut -d'.' -f1)
+    git checkout --orphan $BRANCH
+    git rm -rf .
+    git clean -df
+    echo "started $START" > $JOURNAL_FILE
+    echo "branch $BRANCH" >> $JOURNAL_FILE
+fi
+FORMATTED_DATE=$(date -d @$START +"%d %B %Y - %H:%M")
 popd
 
 export PTS_SILENT_MODE=TRUE
@@ -114,283 +772,28 @@ batch_setup=$(
 )
 echo $batch_setup | $PTS batch-setup
 
-# Delete previously installed tests
-[ ! -d $INSTALL_PATH ] && mkdir $INSTALL_PATH
-rm -rf $INSTALL_PATH/installed-tests/*
+# Delete previously installed tests and test results (unless resuming)
+if [[ $resume -eq 0 ]]; then
+    rm -rf $INSTALL_PATH/installed-tests/*
+    rm -rf ~/.phoronix-test-suite/test-results/$(hostname | cut -d'.' -f1)
+fi
+
 
-# Delete previous test results
-rm -rf ~/.phoronix-test-suite/test-results/$(hostname | cut -d'.' -f1)
+# Lock and marker files of the jobs
+STATE_DIR=$(mktemp -d)
+touch $STATE_DIR/unpublished $STATE_DIR/checkpoint
 
 for p in $(grep -v '#' $PROFILES_FILE); do
     for c in $BASE_CONFIG $OTHER_CONFIG; do
-        # Parse the config file
-        export CONFIG_NAME=$(basename "$c" .json)
-        export LLVM_PATH=$(jq -r '.LLVM_PATH' "$c")
-        export FLAGS=$(jq -r '.FLAGS' "$c")
-        export OPT_FLAG=$(jq -r '.OPT_FLAG' "$c")
-        export NUM_CPU_CORES=$(jq -r '.NUM_CPU_CORES' "$c")
-        export PIN_CMD=$(jq -r '.PIN_CMD' "$c")
-
-        # Backup original number of CPU cores
-        OLD_NUM_CPU_CORES=$NUM_CPU_CORES
-
-        [ ! -d $LLVM_PATH ] && echo "LLVM not found!" && exit 1
-
-        # Export profile name to be used as a identifier in phoronix
-        export TEST_RESULTS_IDENTIFIER=$CONFIG_NAME
-
-        # Override PTS install directory
-        export PTS_TEST_INSTALL_ROOT_PATH=$INSTALL_PATH/installed-tests/$CONFIG_NAME/
-        [ ! -d $PTS_TEST_INSTALL_ROOT_PATH ] && mkdir -p $PTS_TEST_INSTALL_ROOT_PATH
-        INSTALL_DIR=$PTS_TEST_INSTALL_ROOT_PATH"$p"
-
-        # Export basename variable, used to measure compile time in toolchain/
-        export basename=$(basename $p)
-
-        # Point to the toolchain wrappers
-        export CC=$TOOLCHAIN_PATH/clang
-        export CXX=$TOOLCHAIN_PATH/clang++
-
-        # Set compiler flags
-        export CFLAGS=$FLAGS" "$OPT_FLAG
-        export CXXFLAGS=$FLAGS" "$OPT_FLAG
-
-        # Refresh inline remarks
-        INLINE_REMARKS_DIR=$RESULTS_REPO/inline-remarks/$(echo $p | cut -d'/' -f2)/${CONFIG_NAME}
-        [ ! -d $INLINE_REMARKS_DIR ] && mkdir -p $INLINE_REMARKS_DIR
-        INLINE_REMARKS_FILE=$INLINE_REMARKS_DIR/$(echo $OPT_FLAG | tr -d -).txt
-        rm -f $INLINE_REMARKS_FILE
-
-        # Follow inline remarks
-        if [ "$CONFIG_NAME" = "byte" ] && [ $follow_inline_remarks -eq 1 ]; then
-            INLINE_REMARKS_FILE=$RESULTS_REPO/inline-remarks/$(echo $p | cut -d'/' -f2)/base/$(echo $OPT_FLAG | tr -d '-').txt
-            CFLAGS="$CFLAGS -mllvm -cgscc-inline-replay=$INLINE_REMARKS_FILE"
-        fi
-
-        # Set original number of CPU cores
-        export NUM_CPU_CORES=$OLD_NUM_CPU_CORES
-
-        # Install and measure compile time and memory usage
-        [[ $install_only -eq 1 ]] && rounds=1 || rounds=3
-        for ((i=1; i<=rounds; i++)); do
-            echo "Installing $p ($i/$rounds)"
-            rm -rf $INSTALL_DIR
-            export INSTALL_ROUND=$i
-            $PTS batch-install $p
-        done
-
-        # Exit early if install-only is set
-        if [[ $install_only -eq 1 ]]; then
-            echo "Install-only flag is set, skipping test execution and analysis for $p"
-            continue
-        fi
-
-        # Measure object size
-        SIZE_DIR=$RESULTS_REPO/object-size/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME
-        [ ! -d $SIZE_DIR ] && mkdir -p $SIZE_DIR
-        SIZE_FILE=$SIZE_DIR/$(echo $OPT_FLAG | tr -d '-').txt
-        find $INSTALL_DIR -type f -exec file {} \; |
-          grep -Ei "ELF" | cut -d':' -f1 | while read -r file; do
-            size=$(du -b "$file" | cut -f1)
-            echo -e "$size\t$file"
-        done > $SIZE_FILE
-
-        # Measure asm function sizes
-        ASM_DIR=$RESULTS_REPO/asm-diff/$(echo $p | cut -d'/' -f2)/$CONFIG_NAME/$(echo $OPT_FLAG | tr -d '-')
-        [ ! -d $ASM_DIR ] && mkdir -p $ASM_DIR
-        ASM_FILE=$ASM_DIR/sizes.txt
-        find $INSTALL_DIR -type f -exec file {} \; \
-        | grep -Ei "ELF" | cut -d':' -f1 | while read -r binary_file; do
-            nm --size-sort -t d "$binary_file" |
-            grep -E ' T | t ' | awk '{print $1, $3}' >> $ASM_FILE
-        done
-        sort -u -o $ASM_FILE $ASM_FILE
-
-        # Run tests with a single CPU core
-        OLD_NUM_CPU_CORES=$NUM_CPU_CORES
-        export NUM_CPU_CORES=1
-
-        # Run the test
-        result_name=`echo $p | cut -d'/' -f2`"_"
-        echo -n $result_name | $PTS batch-run $p
+        start_job pair_job $p $c
     done
+done
+wait
 
-    # Exit early if install-only is set
-    if [[ $install_only -eq 1 ]]; then
-        echo "Install-only flag is set, skipping assembly difference for $p"
-        continue
-    fi
-
-    # Compare assembly generated by both profiles
-    test_name=$(echo $p | cut -d'/' -f2)
-    echo "Comparing assembly for $test_name..."
-
-    ASM_DIFF_DIR=$RESULTS_REPO/asm-diff/$test_name/$(echo $OPT_FLAG | tr -d '-')
-    [ ! -d $ASM_DIFF_DIR ] && mkdir -p $ASM_DIFF_DIR
-
-    # Create two files for this test
-    diff_func_file="$ASM_DIFF_DIR/diff.txt"
-    all_func_file="$ASM_DIFF_DIR/all.txt"
-    # Add new file for less strict comparison
-    diff_loose_file="$ASM_DIFF_DIR/diff_loose.txt"
-
-    # Define paths to installed binaries for both configurations
-    BASE_DIR=$INSTALL_PATH/installed-tests/$(basename $BASE_CONFIG .json)/$p
-    OTHER_DIR=$INSTALL_PATH/installed-tests/$(basename $OTHER_CONFIG .json)/$p
-
-    # Find all ELF files in base dir
-    elf_files=$(find $BASE_DIR -type f -exec file {} \; | grep -E "ELF" | cut -d':' -f1)
-
-    # Define timeout status file path in asm-diff directory
-    TIMEOUT_FILE=$RESULTS_REPO/asm-diff/$test_name/$(echo $OPT_FLAG | tr -d '-')/timeout.txt
-    touch $TIMEOUT_FILE
-
-    # Run assembly comparison with timeout
-    timeout 10m bash -c "
-        find $BASE_DIR -type f -exec file {} \; | grep -E 'ELF' | cut -d':' -f1 | while read -r base_file; do
-            rel_path=\${base_file#$BASE_DIR/}
-            other_file=$OTHER_DIR/\$rel_path
-            [ ! -f \"\$other_file\" ] && continue
-
-            # Create temporary files for objdump output
-            base_dump=\$(mktemp)
-            other_dump=\$(mktemp)
-
-            # Generate assembly dumps with Intel syntax and no addresses
-            objdump -d -Mintel --no-addresses --no-show-raw-insn \"\$base_file\" > \"\$base_dump\" 2>/dev/null
-            objdump -d -Mintel --no-addresses --no-show-raw-insn \"\$other_file\" > \"\$other_dump\" 2>/dev/null
-
-            # Create binary-specific output files
-            binary_diff_file=\"${diff_func_file}.\$(basename \"\$base_file\")\"
-            binary_all_file=\"${all_func_file}.\$(basename \"\$base_file\")\"
-            binary_loose_file=\"${diff_loose_file}.\$(basename \"\$base_file\")\"
-
-            # Create empty files
-            rm -f \"\$binary_diff_file\" \"\$binary_all_file\" \"\$binary_loose_file\"
-            touch \"\$binary_diff_file\" \"\$binary_all_file\" \"\$binary_loose_file\"
-
-            # Get all functions from both binaries
-            functions=\$(grep -E '^<.*>:' \"\$base_dump\" | sed -E 's/^<(.*)>:/\\1/g' | sort -u)
-
-            while read -r func; do
-                # Skip empty lines and special characters
-                [ -z \"\$func\" ] || echo \"\$func\" | grep -q '[<>]' && continue
-
-                # Extract function contents
-                base_func=\$(sed -n \"/^<\$func>:/,/^<.*>:/p\" \"\$base_dump\" | sed '\$d')
-                other_func=\$(sed -n \"/^<\$func>:/,/^<.*>:/p\" \"\$other_dump\" | sed '\$d')
-
-                # Add to all functions list
-                echo \"\$func\" >> \"\$binary_all_file\"
-
-                # Skip if function doesn't exist in both binaries
-                [ -z \"\$base_func\" ] || [ -z \"\$other_func\" ] && continue
-
-                # === STRICT COMPARISON ===
-                # Compare raw function contents (exact match check)
-                if [ \"\$base_func\" != \"\$other_func\" ]; then
-                    echo \"\$func\" >> \"\$binary_diff_file\"
-
-                    # === SIMPLIFIED LOOSE COMPARISON ===
-                    # Get just the instruction content without function headers
-                    base_content=\$(echo \"\$base_func\" | grep -v '^<.*>:')
-                    other_content=\$(echo \"\$other_func\" | grep -v '^<.*>:')
-
-                    # Clean the content for better comparison (simpler now without addresses)
-                    base_clean=\$(echo \"\$base_content\" | sed 's/^[[:space:]]*//' | grep -v '^$')
-                    other_clean=\$(echo \"\$other_content\" | sed 's/^[[:space:]]*//' | grep -v '^$')
-
-                    # Create temporary files for the cleaned content
-                    base_temp=\$(mktemp)
-                    other_temp=\$(mktemp)
-                    echo \"\$base_clean\" > \"\$base_temp\"
-                    echo \"\$other_clean\" > \"\$other_temp\"
-
-                    # Simple check: if line counts differ, there must be added/removed lines
-                    if [ \"\$(wc -l < \"\$base_temp\")\" -ne \"\$(wc -l < \"\$other_temp\")\" ]; then
-                        echo \"\$func\" >> \"\$binary_loose_file\"
-                    else
-                        # Use a simplified approach to check for added/removed lines
-                        # Create a line-by-line diff
-                        diff_result=\$(diff \"\$base_temp\" \"\$other_temp\" || true)
-
-                        # Check for isolated additions or removals
-                        if echo \"\$diff_result\" | grep -q -E '^(<|>)'; then
-                            # Count < and > lines
-                            removed=\$(echo \"\$diff_result\" | grep -c '^<')
-                            added=\$(echo \"\$diff_result\" | grep -c '^>')
-
-                            # If the counts are different, there are true additions or removals
-                            if [ \"\$removed\" -ne \"\$added\" ]; then
-                                echo \"\$func\" >> \"\$binary_loose_file\"
-                            fi
-                        fi
-                    fi
-
-                    # Clean up temporary files
-                    rm -f \"\$base_temp\" \"\$other_temp\"
-                fi
-            done <<< \"\$functions\"
-
-            # Append binary-specific results to main files
-            cat \"\$binary_diff_file\" >> \"$diff_func_file\" 2>/dev/null || true
-            cat \"\$binary_all_file\" >> \"$all_func_file\" 2>/dev/null || true
-            cat \"\$binary_loose_file\" >> \"$diff_loose_file\" 2>/dev/null || true
-
-            # Clean up temporary files
-            rm -f \"\$base_dump\" \"\$other_dump\" \"\$binary_diff_file\" \"\$binary_all_file\" \"\$binary_loose_file\"
-        done
-
-        # Sort and deduplicate results
-        sort -u \"$diff_func_file\" -o \"$diff_func_file\"
-        sort -u \"$all_func_file\" -o \"$all_func_file\"
-        sort -u \"$diff_loose_file\" -o \"$diff_loose_file\"
-    " >/dev/null 2>&1
-
-    # Check if timeout occurred (exit code 124)
-    [ $? -eq 124 ] && echo "y" > $TIMEOUT_FILE || echo "n" > $TIMEOUT_FILE
-
-    # Copy results
-    pushd ~/.phoronix-test-suite
-    xml_file="test-results/$(hostname | cut -d'.' -f1)/composite.xml"
-    target_dir="$RESULTS_REPO/$(dirname $xml_file)/$(echo $OPT_FLAG | tr -d '-')"
-    [ ! -d $target_dir ] && mkdir -p $target_dir
-    cp $xml_file "$target_dir/"
-    popd
-
-    # TODO: HARDCODED -O2
-    python3 results-to-csv.py $RESULTS_REPO $TEST_PROFILES_PATH "O3" -mp
-
-    # Write README.md
-    echo "# $FORMATTED_DATE @ $(hostname)" > $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    [ $follow_inline_remarks -eq 1 ] && checkbox="[x]" || checkbox="[ ]"
-    echo "Follow inline remarks: $checkbox" >> "$RESULTS_REPO/README.md"
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## Compilation Time" >> $RESULTS_REPO/README.md
-    echo "![Compilation Time](plots/compile-time.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## Runtime" >> $RESULTS_REPO/README.md
-    echo "![Runtime](plots/runtime.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## Memory Usage" >> $RESULTS_REPO/README.md
-    echo "![Memory Usage](plots/memory-usage.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## Object Size" >> $RESULTS_REPO/README.md
-    echo "![Object Size](plots/object-size.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## ASM Size" >> $RESULTS_REPO/README.md
-    echo "![ASM Size](plots/asm-size.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-    echo "## ASM Diff" >> $RESULTS_REPO/README.md
-    echo "![ASM Diff](plots/asm-diff.svg)" >> $RESULTS_REPO/README.md
-    echo "" >> $RESULTS_REPO/README.md
-
-    pushd $RESULTS_REPO
-    find . -name "s,^.*" | xargs rm -rf
-    git add .
-    git commit --no-gpg-sign -m "$CONFIG_NAME($(echo $OPT_FLAG | tr -d '-')): $p"
-    git push -f
-    popd
+# Commit the final results of all tests on top of the published checkpoints
+if [[ $install_only -eq 0 ]]; then
+    setup_config $(grep -v '#' $PROFILES_FILE | head -1) $OTHER_CONFIG
+    checkpoint "$CONFIG_NAME($(echo $OPT_FLAG | tr -d '-')): $(grep -v '#' $PROFILES_FILE | paste -sd' ')"
+fi
 
-done
+rm -rf $STATE_DIR
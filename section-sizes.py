@@ -0,0 +1,33 @@
+import argparse
+import os
+from collections import Counter
+
+from elfutils import ELFError, ELFFile, read_manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the size of each ELF section across a manifest"
+    )
+    parser.add_argument("manifest_file", type=str, help="ELF manifest file")
+    parser.add_argument("sizes_file", type=str, help="Output section sizes file")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.manifest_file):
+        print(f"Manifest file {args.manifest_file} does not exist!")
+        exit(1)
+
+    # Aggregate section sizes across all ELF files of the install
+    section_sizes = Counter()
+    for path, _, _, _ in read_manifest(args.manifest_file):
+        try:
+            with ELFFile(path) as elf:
+                for section, size in elf.section_sizes():
+                    section_sizes[section] += size
+        except (OSError, ELFError) as e:
+            print(f"Skipping {path}: {e}")
+
+    print(f"Writing section sizes to {args.sizes_file}")
+    with open(args.sizes_file, "w") as f:
+        for section, size in section_sizes.most_common():
+            f.write(f"{size}\t{section}\n")
@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+from collections import Counter
+
+
+def trace_totals(trace_file):
+    # Clang summarizes each pass/phase of a translation unit with a
+    # "Total <name>" event, holding its accumulated duration (in us)
+    with open(trace_file, "r") as f:
+        trace = json.load(f)
+
+    for event in trace.get("traceEvents", []):
+        name = event.get("name", "")
+        if event.get("ph") == "X" and name.startswith("Total "):
+            yield name[len("Total ") :], event.get("dur", 0)
+
+
+def aggregate_traces(trace_dir):
+    # Process the traces one at a time, only keeping the running totals
+    totals = Counter()
+    num_traces = 0
+    for entry in sorted(os.scandir(trace_dir), key=lambda entry: entry.name):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            for name, duration in trace_totals(entry.path):
+                totals[name] += duration
+            num_traces += 1
+        except (OSError, ValueError):
+            # Failed compiles leave empty traces behind
+            continue
+
+    return totals, num_traces
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sum the clang -ftime-trace durations of each pass/phase"
+    )
+    parser.add_argument("trace_dir", type=str, help="Directory with the time traces")
+    parser.add_argument("output_file", type=str, help="Output durations file")
+    parser.add_argument(
+        "--remove", action="store_true", help="Remove the traces after aggregating"
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.trace_dir):
+        print(f"Trace directory {args.trace_dir} does not exist!")
+        exit(1)
+
+    totals, num_traces = aggregate_traces(args.trace_dir)
+
+    print(f"Writing time trace totals of {num_traces} traces to {args.output_file}")
+    with open(args.output_file, "w") as f:
+        for name, duration in totals.most_common():
+            f.write(f"{duration}\t{name}\n")
+
+    if args.remove:
+        for entry in os.scandir(args.trace_dir):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
@@ -0,0 +1,91 @@
+import fcntl
+import json
+import os
+import sys
+import time
+
+SOURCE_EXTENSIONS = (
+    ".c",
+    ".cc",
+    ".cp",
+    ".cpp",
+    ".cxx",
+    ".c++",
+    ".C",
+    ".m",
+    ".mm",
+    ".s",
+    ".S",
+)
+
+
+def input_file(argv):
+    for arg in argv[1:]:
+        if not arg.startswith("-") and arg.endswith(SOURCE_EXTENSIONS):
+            return arg
+    return None
+
+
+def run(argv):
+    # Measure the compiler process itself (not the wrapper) with wait4
+    start = time.monotonic_ns()
+    pid = os.posix_spawn(argv[0], argv, os.environ)
+    while True:
+        try:
+            _, status, rusage = os.wait4(pid, 0)
+            break
+        except InterruptedError:
+            continue
+    wall_ns = time.monotonic_ns() - start
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code < 0:
+        exit_code = 128 - exit_code
+
+    return exit_code, {
+        "wall_ms": wall_ns / 1e6,
+        "user_ms": rusage.ru_utime * 1000,
+        "sys_ms": rusage.ru_stime * 1000,
+        "maxrss_kb": rusage.ru_maxrss,
+    }
+
+
+def append_record(record_file, record):
+    # One write per record under an exclusive lock, as compilers run in parallel
+    line = (json.dumps(record) + "\n").encode()
+    fd = os.open(record_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+if __name__ == "__main__":
+    # Usage: rusage-record.py <record_file> -- <compiler> [args...]
+    if len(sys.argv) < 4 or sys.argv[2] != "--":
+        print(f"Usage: {sys.argv[0]} <record_file> -- <compiler> [args...]")
+        exit(1)
+
+    record_file = sys.argv[1]
+    argv = sys.argv[3:]
+
+    exit_code, usage = run(argv)
+    append_record(
+        record_file,
+        {
+            "test": os.environ.get("basename"),
+            "config": os.environ.get("CONFIG_NAME"),
+            "round": os.environ.get("INSTALL_ROUND"),
+            "cwd": os.getcwd(),
+            "argv": argv,
+            "input": input_file(argv),
+            "wall_ms": usage["wall_ms"],
+            "user_ms": usage["user_ms"],
+            "sys_ms": usage["sys_ms"],
+            "cpu_ms": usage["user_ms"] + usage["sys_ms"],
+            "maxrss_kb": usage["maxrss_kb"],
+            "exit_code": exit_code,
+        },
+    )
+    exit(exit_code)